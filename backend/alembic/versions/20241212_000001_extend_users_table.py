@@ -20,6 +20,9 @@ down_revision = "20241203_000001"
 branch_labels = None
 depends_on = None
 
+# Rows per UUID backfill batch; each batch commits on its own
+_BACKFILL_BATCH_SIZE = 10_000
+
 
 def upgrade() -> None:
     # Get the current connection's dialect
@@ -27,28 +30,39 @@ def upgrade() -> None:
     dialect = bind.dialect.name
 
     # Add new columns
-    op.add_column(
-        "users",
-        sa.Column("department", sa.String(length=100), nullable=True),
-    )
-    op.add_column(
-        "users",
-        sa.Column(
-            "balance",
-            sa.Numeric(precision=12, scale=2),
-            nullable=False,
-            server_default="1000.00",
-        ),
-    )
-    op.add_column(
-        "users",
-        sa.Column(
-            "updated_at",
-            sa.DateTime(timezone=True),
-            nullable=False,
-            server_default=sa.func.now(),
-        ),
-    )
+    if dialect == "postgresql":
+        # Single ALTER TABLE so the table is scanned once for all three columns.
+        # The defaults are non-volatile (now() is STABLE), so PostgreSQL 11+
+        # stores them as metadata instead of rewriting every row.
+        op.execute(
+            "ALTER TABLE users "
+            "ADD COLUMN department VARCHAR(100) NULL, "
+            "ADD COLUMN balance NUMERIC(12, 2) NOT NULL DEFAULT 1000.00, "
+            "ADD COLUMN updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()"
+        )
+    else:
+        op.add_column(
+            "users",
+            sa.Column("department", sa.String(length=100), nullable=True),
+        )
+        op.add_column(
+            "users",
+            sa.Column(
+                "balance",
+                sa.Numeric(precision=12, scale=2),
+                nullable=False,
+                server_default="1000.00",
+            ),
+        )
+        op.add_column(
+            "users",
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                nullable=False,
+                server_default=sa.func.now(),
+            ),
+        )
 
     if dialect == "postgresql":
         # PostgreSQL: Change id column from Integer to UUID
@@ -61,7 +75,7 @@ def upgrade() -> None:
         )
 
         # Generate UUIDs for existing rows
-        op.execute("UPDATE users SET new_id = uuid_generate_v4()")
+        _backfill_new_ids(bind)
 
         # Make new_id not nullable
         op.alter_column("users", "new_id", nullable=False)
@@ -81,6 +95,35 @@ def upgrade() -> None:
         pass
 
 
+def _backfill_new_ids(bind: sa.engine.Connection) -> None:
+    """Fill users.new_id in keyset-paginated batches.
+
+    Each batch commits separately (autocommit block) so a large users table
+    never holds one long transaction or a single burst of WAL.
+    """
+    if op.get_context().as_sql:
+        # Offline (--sql) mode cannot read back batch results
+        op.execute("UPDATE users SET new_id = uuid_generate_v4()")
+        return
+
+    batch_update = sa.text(
+        "UPDATE users SET new_id = uuid_generate_v4() "
+        "WHERE id IN ("
+        "SELECT id FROM users WHERE id > :last_id ORDER BY id LIMIT :batch_size"
+        ") RETURNING id"
+    )
+    last_id = 0
+    with op.get_context().autocommit_block():
+        while True:
+            ids = bind.execute(
+                batch_update,
+                {"last_id": last_id, "batch_size": _BACKFILL_BATCH_SIZE},
+            ).scalars().all()
+            if not ids:
+                break
+            last_id = max(ids)
+
+
 def downgrade() -> None:
     # Get the current connection's dialect
     bind = op.get_bind()
@@ -27,11 +27,7 @@ def upgrade() -> None:
         sa.Column("sort_order", sa.Integer, nullable=False, server_default="0"),
     )
 
-    # Create index for sort_order for efficient ordering
-    op.create_index("ix_categories_sort_order", "categories", ["sort_order"])
-
 
 def downgrade() -> None:
     """Drop categories table."""
-    op.drop_index("ix_categories_sort_order", table_name="categories")
     op.drop_table("categories")
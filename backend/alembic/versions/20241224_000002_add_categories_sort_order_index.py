@@ -0,0 +1,53 @@
+"""Add index on categories.sort_order.
+
+Revision ID: 20241224_000002
+Revises: 20241224_000001
+Create Date: 2024-12-24
+
+On PostgreSQL the index is built CONCURRENTLY outside the migration
+transaction so writers to categories are not blocked during the build.
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20241224_000002"
+down_revision: str | None = "20241224_000001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create index for sort_order for efficient ordering."""
+    bind = op.get_bind()
+
+    if bind.dialect.name == "postgresql":
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_categories_sort_order "
+                "ON categories (sort_order)"
+            )
+    else:
+        op.create_index(
+            "ix_categories_sort_order",
+            "categories",
+            ["sort_order"],
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Drop sort_order index."""
+    bind = op.get_bind()
+
+    if bind.dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_categories_sort_order")
+    else:
+        op.drop_index(
+            "ix_categories_sort_order",
+            table_name="categories",
+            if_exists=True,
+        )
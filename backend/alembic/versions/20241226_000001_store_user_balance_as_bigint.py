@@ -0,0 +1,67 @@
+"""Store users.balance as BIGINT hundredths.
+
+Revision ID: 20241226_000001
+Revises: 20241224_000002
+Create Date: 2024-12-26
+
+balance moves from NUMERIC(12, 2) to a BIGINT count of hundredths
+(1000.00 -> 100000). The ORM maps it back to Decimal via FixedPoint.
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20241226_000001"
+down_revision: str | None = "20241224_000002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Convert balance to BIGINT hundredths."""
+    bind = op.get_bind()
+
+    if bind.dialect.name == "postgresql":
+        # One statement (and one table rewrite) for the type and default change
+        op.execute(
+            "ALTER TABLE users "
+            "ALTER COLUMN balance DROP DEFAULT, "
+            "ALTER COLUMN balance TYPE BIGINT USING round(balance * 100)::bigint, "
+            "ALTER COLUMN balance SET DEFAULT 100000"
+        )
+    else:
+        op.execute("UPDATE users SET balance = CAST(ROUND(balance * 100) AS INTEGER)")
+        with op.batch_alter_table("users") as batch_op:
+            batch_op.alter_column(
+                "balance",
+                existing_type=sa.Numeric(precision=12, scale=2),
+                type_=sa.BigInteger(),
+                existing_nullable=False,
+                server_default="100000",
+            )
+
+
+def downgrade() -> None:
+    """Convert balance back to NUMERIC(12, 2)."""
+    bind = op.get_bind()
+
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            "ALTER TABLE users "
+            "ALTER COLUMN balance DROP DEFAULT, "
+            "ALTER COLUMN balance TYPE NUMERIC(12, 2) USING balance / 100.0, "
+            "ALTER COLUMN balance SET DEFAULT 1000.00"
+        )
+    else:
+        with op.batch_alter_table("users") as batch_op:
+            batch_op.alter_column(
+                "balance",
+                existing_type=sa.BigInteger(),
+                type_=sa.Numeric(precision=12, scale=2),
+                existing_nullable=False,
+                server_default="1000.00",
+            )
+        op.execute("UPDATE users SET balance = balance / 100.0")
@@ -3,17 +3,24 @@ Authentication API endpoints - SPEC Section 5 compliant.
 """
 from __future__ import annotations
 
+import itertools
+import time
+from functools import lru_cache
 from typing import Annotated
 from uuid import uuid4
 
+import orjson
 from fastapi import APIRouter, Depends, Query, status
-from fastapi.responses import RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse, Response
 from pydantic import BaseModel
 
 from app.core.auth import create_access_token, get_current_user_id
 from app.core.config import settings
 
-router = APIRouter(tags=["auth"])
+router = APIRouter(tags=["auth"], default_response_class=ORJSONResponse)
+
+# Access token lifetime in seconds, reported as expires_in
+_EXPIRES_IN = settings.jwt_expire_minutes * 60
 
 
 class TokenResponse(BaseModel):
@@ -35,22 +42,72 @@ class UserResponse(BaseModel):
     balance: float = 1000.00
 
 
-# Mock user database for development
-_mock_users: dict[str, dict] = {}
+# Mock user store for development, bounded by an LRU cache.
+# Entries are immutable tuples ordered as _MOCK_USER_FIELDS.
+_MOCK_USER_FIELDS = ("id", "email", "name", "role", "department", "balance")
+
+
+@lru_cache(maxsize=10_000)
+def _build_mock_user(user_id: str) -> tuple[str, str, str, str, str, float]:
+    """Build the mock user's field values, in _MOCK_USER_FIELDS order.
+
+    Pure function of user_id; the result is memoized, so repeated calls for
+    the same id return the same tuple.
+    """
+    return (
+        user_id,
+        f"user-{user_id[:8]}@example.com",
+        f"Mock User {user_id[:8]}",
+        "user",
+        "Engineering",
+        1000.00,
+    )
+
+
+@lru_cache(maxsize=10_000)
+def _mock_user_json(user_id: str) -> bytes:
+    """Serialized UserResponse body for a mock user (immutable once built).
+
+    Same bytes as ORJSONResponse renders for the model, including raw UTF-8
+    (not ASCII escapes) for non-ASCII text.
+    """
+    user = UserResponse(**dict(zip(_MOCK_USER_FIELDS, _build_mock_user(user_id))))
+    return orjson.dumps(user.model_dump())
 
 
-def _get_or_create_mock_user(user_id: str) -> dict:
-    """Get or create a mock user for development."""
-    if user_id not in _mock_users:
-        _mock_users[user_id] = {
-            "id": user_id,
-            "email": f"user-{user_id[:8]}@example.com",
-            "name": f"Mock User {user_id[:8]}",
-            "role": "user",
-            "department": "Engineering",
-            "balance": 1000.00,
-        }
-    return _mock_users[user_id]
+# Pre-issued (user_id, token, refresh_at) entries handed out round-robin by the
+# mock callback. Each entry is re-signed on its own once half of the token
+# lifetime has elapsed, so handed-out tokens always have a usable remaining
+# lifetime and a request never pays for more than one signing.
+_MOCK_POOL_SIZE = 1024
+_mock_pool: list[tuple[str, str, float]] = []
+_mock_pool_index = itertools.count()
+
+
+def _build_mock_pool() -> None:
+    """Build the pool of mock users and their access tokens (run at import)."""
+    refresh_at = time.time() + _EXPIRES_IN / 2
+    pool = []
+    for _ in range(_MOCK_POOL_SIZE):
+        user_id = str(uuid4())
+        _build_mock_user(user_id)
+        pool.append((user_id, create_access_token(subject=user_id), refresh_at))
+
+    _mock_pool[:] = pool
+
+
+def _next_mock_token() -> str:
+    """Return the next pre-issued mock token, re-signing just that entry when stale."""
+    i = next(_mock_pool_index) % _MOCK_POOL_SIZE
+    user_id, token, refresh_at = _mock_pool[i]
+    now = time.time()
+    if now >= refresh_at:
+        token = create_access_token(subject=user_id)
+        _mock_pool[i] = (user_id, token, now + _EXPIRES_IN / 2)
+    return token
+
+
+_build_mock_pool()
 
 
 @router.get("/login", response_model=None)
@@ -87,17 +144,12 @@ async def callback(code: Annotated[str, Query(description="Authorization code")]
     Returns:
         Access token response
     """
-    # Mock mode: create a mock user and return token
+    # Mock mode: hand out a pre-issued token for a mock user
     # TODO: Implement Azure AD token exchange when auth_provider != "mock"
-    user_id = str(uuid4())
-    _get_or_create_mock_user(user_id)
-
-    token = create_access_token(subject=user_id)
-
     return TokenResponse(
-        access_token=token,
+        access_token=_next_mock_token(),
         token_type="bearer",
-        expires_in=settings.jwt_expire_minutes * 60,
+        expires_in=_EXPIRES_IN,
     )
 
 
@@ -121,10 +173,14 @@ async def logout(
     return {"message": "Successfully logged out"}
 
 
-@router.get("/me", response_model=UserResponse)
+@router.get(
+    "/me",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": UserResponse}},
+)
 async def get_me(
     current_user_id: Annotated[str, Depends(get_current_user_id)],
-) -> UserResponse:
+) -> Response:
     """Get current user information.
 
     Args:
@@ -136,10 +192,6 @@ async def get_me(
     Raises:
         NotFoundError: If user not found in database
     """
-    # Mock mode: return mock user data
+    # Mock mode: return the pre-serialized mock user data
     # TODO: Implement database lookup when auth_provider != "mock"
-    user = _mock_users.get(current_user_id)
-    if user is None:
-        # Create a mock user if not exists (for testing)
-        user = _get_or_create_mock_user(current_user_id)
-    return UserResponse(**user)
+    return Response(content=_mock_user_json(current_user_id), media_type="application/json")
@@ -4,20 +4,39 @@ SPEC Section 5 compliant.
 """
 from __future__ import annotations
 
-from typing import Any
+from collections.abc import AsyncIterator
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, status
-from sqlalchemy import select
+import orjson
+from fastapi import APIRouter, Body, Depends, Query, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncScalarResult, AsyncSession
+from sqlalchemy.sql.dml import ReturningInsert
 
 from app.core.exceptions import ValidationError
-from app.core.rbac import RoleChecker, UserRole
+from app.core.rbac import require_admin, require_user
 from app.db.session import get_db
 from app.models.category import Category
 from app.schemas.category import CategoryCreate, CategoryResponse
 
-router = APIRouter(prefix="/categories", tags=["categories"])
+router = APIRouter(
+    prefix="/categories",
+    tags=["categories"],
+    default_response_class=ORJSONResponse,
+)
+
+# Maximum number of categories accepted by a single bulk create request
+MAX_BULK_CREATE = 1000
+
+# Built once at import; the statement is constant, so each request reuses the
+# same Select and hits SQLAlchemy's compiled cache without reconstructing it.
+_LIST_CATEGORIES_STMT = select(Category).order_by(Category.sort_order)
+
+# Rows fetched per server-side cursor round-trip when streaming categories
+_STREAM_BATCH_SIZE = 500
 
 
 @router.get(
@@ -28,15 +47,44 @@ router = APIRouter(prefix="/categories", tags=["categories"])
 )
 async def list_categories(
     db: AsyncSession = Depends(get_db),
-    _user: dict[str, Any] = Depends(RoleChecker(UserRole.USER)),
-) -> list[Category]:
+    _user: dict[str, Any] = Depends(require_user),
+) -> StreamingResponse:
     """List all categories ordered by sort_order.
 
+    Rows are read through a server-side cursor and written to the response
+    as a JSON array one batch at a time, so memory stays bounded by the
+    batch size rather than the table size.
+
     Returns:
-        List of categories ordered by sort_order ascending.
+        Streaming JSON array of categories ordered by sort_order ascending.
     """
-    result = await db.execute(select(Category).order_by(Category.sort_order))
-    return list(result.scalars().all())
+    result = await db.stream_scalars(
+        _LIST_CATEGORIES_STMT.execution_options(yield_per=_STREAM_BATCH_SIZE)
+    )
+    return StreamingResponse(_stream_categories(result), media_type="application/json")
+
+
+async def _stream_categories(
+    result: AsyncScalarResult[Category],
+) -> AsyncIterator[bytes]:
+    """Serialize a streamed Category result as a JSON array.
+
+    Args:
+        result: Async scalar result yielding Category rows
+
+    Yields:
+        Chunks of the JSON array, one per fetched batch
+    """
+    yield b"["
+    first = True
+    async for batch in result.partitions():
+        chunk = b",".join(
+            orjson.dumps(CategoryResponse.model_validate(category).model_dump())
+            for category in batch
+        )
+        yield chunk if first else b"," + chunk
+        first = False
+    yield b"]"
 
 
 @router.post(
@@ -49,7 +97,7 @@ async def list_categories(
 async def create_category(
     category_data: CategoryCreate,
     db: AsyncSession = Depends(get_db),
-    _user: dict[str, Any] = Depends(RoleChecker(UserRole.ADMIN)),
+    _user: dict[str, Any] = Depends(require_admin),
 ) -> Category:
     """Create a new category.
 
@@ -81,3 +129,79 @@ async def create_category(
         ) from e
 
     return category
+
+
+def _bulk_insert_stmt(
+    dialect_name: str, ignore_conflicts: bool
+) -> ReturningInsert[tuple[Category]]:
+    """Build the INSERT ... RETURNING statement for create_categories_bulk.
+
+    Without conflicts every row comes back, so SQLAlchemy is asked to return
+    them in parameter order. With ON CONFLICT DO NOTHING skipped rows make
+    the row count differ from the parameters, which sort_by_parameter_order
+    rejects on PostgreSQL, so the caller reorders those results by name.
+    """
+    if not ignore_conflicts:
+        return insert(Category).returning(Category, sort_by_parameter_order=True)
+
+    dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    return (
+        dialect_insert(Category)
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(Category)
+    )
+
+
+@router.post(
+    "/bulk",
+    response_model=list[CategoryResponse],
+    status_code=status.HTTP_201_CREATED,
+    summary="Create categories in bulk",
+    description=(
+        f"Create up to {MAX_BULK_CREATE} categories with a single INSERT statement. Admin only."
+    ),
+)
+async def create_categories_bulk(
+    payload: Annotated[
+        list[CategoryCreate],
+        Body(min_length=1, max_length=MAX_BULK_CREATE),
+    ],
+    ignore_conflicts: Annotated[
+        bool,
+        Query(description="Skip categories whose name already exists"),
+    ] = False,
+    db: AsyncSession = Depends(get_db),
+    _user: dict[str, Any] = Depends(require_admin),
+) -> list[Category]:
+    """Create multiple categories in one round-trip.
+
+    Args:
+        payload: Categories to create
+        ignore_conflicts: If True, categories with an existing name are skipped
+
+    Returns:
+        The created categories in request order (skipped conflicts are not
+        included)
+
+    Raises:
+        ValidationError: If a category name already exists and
+            ignore_conflicts is False
+    """
+    rows = [item.model_dump() for item in payload]
+    stmt = _bulk_insert_stmt(db.get_bind().dialect.name, ignore_conflicts)
+
+    try:
+        result = await db.scalars(stmt, rows)
+        categories = list(result.all())
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise ValidationError(
+            message="One or more category names already exist",
+            details={"field": "name"},
+        ) from e
+
+    if ignore_conflicts:
+        position = {row["name"]: i for i, row in enumerate(rows)}
+        categories.sort(key=lambda category: position[category.name])
+    return categories
@@ -3,18 +3,68 @@ Authentication utilities for JWT token handling.
 """
 from __future__ import annotations
 
-from datetime import UTC, datetime, timedelta
+import base64
+import hashlib
+import hmac
+import time
+from datetime import timedelta
 from typing import Any, cast
 
-from fastapi import Depends
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import ExpiredSignatureError, JWTError, jwt
+import jwt
+import orjson
+from fastapi import Depends, Request
+from fastapi.security import HTTPBearer
 
 from app.core.config import settings
 from app.core.exceptions import TokenExpiredError, UnauthorizedError
 
-# HTTP Bearer token security scheme
-security = HTTPBearer(auto_error=False)
+# JWT settings resolved once at import to keep them off the per-request path
+_JWT_SECRET = settings.jwt_secret_key.encode()
+_JWT_ALG = settings.jwt_algorithm
+_JWT_EXP_DELTA = timedelta(minutes=settings.jwt_expire_minutes)
+
+# HMAC algorithms are signed without PyJWT (see create_access_token); other
+# algorithms go through jwt.encode
+_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+_JWT_DIGEST = _HMAC_DIGESTS.get(_JWT_ALG)
+
+# Verified payloads keyed by token digest: sha256(token) -> (cache_expires_at, payload).
+# Raw bearer tokens are never kept in memory, and entries never outlive the
+# token's own exp claim, so expiry is still enforced.
+_DECODE_CACHE_MAXSIZE = 10_000
+_DECODE_CACHE_TTL = 30  # seconds
+_decode_cache: dict[bytes, tuple[float, dict[str, Any]]] = {}
+
+# Anything shorter cannot be a header.payload.signature JWT
+_MIN_TOKEN_LENGTH = 20
+
+
+def _cache_key(token: str) -> bytes:
+    """Digest a raw token into its decode cache key."""
+    return hashlib.sha256(token.encode()).digest()
+
+
+def _remember_payload(key: bytes, payload: dict[str, Any], now: float) -> None:
+    """Store a verified payload in the decode cache, evicting the oldest entry if full."""
+    if len(_decode_cache) >= _DECODE_CACHE_MAXSIZE:
+        # Evict the oldest entry (dicts preserve insertion order)
+        del _decode_cache[next(iter(_decode_cache))]
+    expires_at = now + _DECODE_CACHE_TTL
+    # exp is optional in a JWT; tokens without it are cached for the TTL only
+    exp = payload.get("exp")
+    if exp is not None:
+        expires_at = min(expires_at, exp)
+    _decode_cache[key] = (expires_at, payload)
+
+
+def _b64url(data: bytes) -> bytes:
+    """Unpadded base64url encoding used by JWS segments."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# The header never changes, so its encoded segment is built once (same bytes
+# PyJWT produces: sorted keys, compact separators)
+_JWT_HEADER_B64 = _b64url(orjson.dumps({"alg": _JWT_ALG, "typ": "JWT"}))
 
 
 def create_access_token(
@@ -24,6 +74,15 @@ def create_access_token(
 ) -> str:
     """Create a JWT access token.
 
+    With an HMAC algorithm, an ASCII subject and no additional claims the
+    token is assembled directly from the pre-encoded header, an orjson payload
+    and one hmac call, skipping PyJWT's per-call header, key and claim
+    processing. The output is byte-identical to jwt.encode; non-ASCII
+    subjects go through jwt.encode, since PyJWT ASCII-escapes them where
+    orjson writes raw UTF-8. Such tokens are also seeded into the decode
+    cache, since this process has just signed them, so decoding them back
+    needs no signature verification.
+
     Args:
         subject: The subject of the token (typically user ID)
         expires_delta: Optional custom expiry time
@@ -33,23 +92,31 @@ def create_access_token(
         Encoded JWT token string
     """
     if expires_delta is None:
-        expires_delta = timedelta(minutes=settings.jwt_expire_minutes)
+        expires_delta = _JWT_EXP_DELTA
 
-    expire = datetime.now(UTC) + expires_delta
+    now = time.time()
 
     to_encode: dict[str, Any] = {
         "sub": subject,
-        "exp": expire,
-        "iat": datetime.now(UTC),
+        "exp": int(now + expires_delta.total_seconds()),
+        "iat": int(now),
     }
 
+    if _JWT_DIGEST is not None and not additional_claims and subject.isascii():
+        signing_input = _JWT_HEADER_B64 + b"." + _b64url(orjson.dumps(to_encode))
+        signature = hmac.new(_JWT_SECRET, signing_input, _JWT_DIGEST).digest()
+        token = (signing_input + b"." + _b64url(signature)).decode()
+        if to_encode["exp"] > now:
+            _remember_payload(_cache_key(token), to_encode, now)
+        return token
+
     if additional_claims:
         to_encode.update(additional_claims)
 
     encoded: str = jwt.encode(
         to_encode,
-        settings.jwt_secret_key,
-        algorithm=settings.jwt_algorithm,
+        _JWT_SECRET,
+        algorithm=_JWT_ALG,
     )
     return encoded
 
@@ -57,6 +124,11 @@ def create_access_token(
 def decode_access_token(token: str) -> dict[str, Any]:
     """Decode and verify a JWT access token.
 
+    Verified payloads are cached for a short time so clients reusing the same
+    bearer token skip signature verification on subsequent requests; callers
+    always receive a shallow copy so the cached payload cannot be mutated. Tokens
+    that are not shaped like a JWT are rejected without verification.
+
     Args:
         token: The JWT token string to decode
 
@@ -67,26 +139,79 @@ def decode_access_token(token: str) -> dict[str, Any]:
         TokenExpiredError: If the token has expired
         UnauthorizedError: If the token is invalid
     """
+    # Reject obviously malformed tokens before any hashing/base64/HMAC work
+    if len(token) < _MIN_TOKEN_LENGTH or token.count(".") != 2:
+        raise UnauthorizedError(message="Invalid token")
+
+    now = time.time()
+    key = _cache_key(token)
+    cached = _decode_cache.get(key)
+    if cached is not None:
+        if now < cached[0]:
+            return dict(cached[1])
+        del _decode_cache[key]
+
+    # The explicit allow-list pins verification to the configured algorithm.
+    # HS* signatures go through the stdlib hmac module (OpenSSL); asymmetric
+    # algorithms additionally require the cryptography package.
     try:
         payload: dict[str, Any] = jwt.decode(
             token,
-            settings.jwt_secret_key,
-            algorithms=[settings.jwt_algorithm],
+            _JWT_SECRET,
+            algorithms=[_JWT_ALG],
         )
-        return payload
-    except ExpiredSignatureError as e:
+    except jwt.ExpiredSignatureError as e:
         raise TokenExpiredError() from e
-    except JWTError as e:
+    except jwt.InvalidTokenError as e:
         raise UnauthorizedError(message="Invalid token") from e
 
+    _remember_payload(key, payload, now)
+    return dict(payload)
+
+
+def get_bearer_token(request: Request) -> str | None:
+    """Extract the raw Bearer token from the Authorization header.
+
+    Reads the header directly instead of going through HTTPBearer, so no
+    HTTPAuthorizationCredentials object is built per request.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        The token string, or None if the header is missing or not Bearer
+    """
+    authorization = request.headers.get("authorization")
+    if not authorization or authorization[:7].lower() != "bearer ":
+        return None
+    return authorization[7:] or None
+
+
+class BearerToken(HTTPBearer):
+    """HTTP Bearer security scheme that resolves to the raw token string.
+
+    Declares the scheme in OpenAPI like HTTPBearer, but parses the header with
+    get_bearer_token instead of building HTTPAuthorizationCredentials.
+    """
+
+    async def __call__(self, request: Request) -> str | None:  # type: ignore[override]
+        return get_bearer_token(request)
+
+
+# FastAPI cannot resolve postponed (string) annotations on callable instances
+BearerToken.__call__.__annotations__["request"] = Request
+
+# HTTP Bearer token security scheme
+security = BearerToken(scheme_name="HTTPBearer", auto_error=False)
+
 
 async def get_current_user_id(
-    credentials: HTTPAuthorizationCredentials | None = Depends(security),
+    token: str | None = Depends(security),
 ) -> str:
     """FastAPI dependency to get the current user ID from JWT token.
 
     Args:
-        credentials: HTTP Bearer credentials from request header
+        token: Bearer token from the Authorization header
 
     Returns:
         The user ID from the token
@@ -94,10 +219,10 @@ async def get_current_user_id(
     Raises:
         UnauthorizedError: If no token provided or token is invalid
     """
-    if credentials is None:
+    if token is None:
         raise UnauthorizedError(message="Authentication required")
 
-    payload = decode_access_token(credentials.credentials)
+    payload = decode_access_token(token)
     user_id = payload.get("sub")
 
     if user_id is None:
@@ -6,8 +6,9 @@ from __future__ import annotations
 
 from typing import Any
 
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.exceptions import AppError
 
@@ -34,33 +35,76 @@ def create_error_response(
     }
 
 
-async def app_error_handler(
-    request: Request,
-    exc: AppError,
-) -> JSONResponse:
-    """Handle AppError and return JSON response.
+def render_error_body(exc: AppError) -> bytes:
+    """Serialize an AppError to the standard JSON error body.
+
+    Subclasses with a fixed code carry its string as CODE_STR, so only a bare
+    AppError needs the Enum .value lookup.
 
     Args:
-        request: The FastAPI request object
         exc: The AppError instance
 
     Returns:
-        JSONResponse with error details and appropriate status code
+        UTF-8 encoded JSON with error_code, message, and details fields
+    """
+    code = exc.CODE_STR if exc.CODE_STR is not None else exc.error_code.value
+    return orjson.dumps({"error_code": code, "message": exc.message, "details": exc.details})
+
+
+class AppErrorMiddleware:
+    """Pure ASGI middleware that turns AppError into a JSON error response.
+
+    Wraps the application in a single try/except and writes the response
+    messages itself, so an error costs no Request/Response objects or
+    exception-handler lookup. Errors carrying their default message and no
+    details are answered with the body pre-serialized on the class. Errors
+    raised after the response has started cannot be rewritten and are
+    re-raised.
     """
-    return JSONResponse(
-        status_code=exc.status_code,
-        content=create_error_response(
-            error_code=exc.error_code.value,
-            message=exc.message,
-            details=exc.details,
-        ),
-    )
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except AppError as exc:
+            if response_started:
+                raise
+            if exc.has_default_body:
+                body, content_length = exc.DEFAULT_BODY, exc.DEFAULT_CONTENT_LENGTH
+            else:
+                body = render_error_body(exc)
+                content_length = str(len(body)).encode("latin-1")
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": exc.status_code,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", content_length),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": body})
 
 
 def register_exception_handlers(app: FastAPI) -> None:
-    """Register all exception handlers with the FastAPI application.
+    """Install AppError handling on the FastAPI application.
 
     Args:
         app: The FastAPI application instance
     """
-    app.add_exception_handler(AppError, app_error_handler)  # type: ignore[arg-type]
+    app.add_middleware(AppErrorMiddleware)
@@ -5,7 +5,9 @@ SPEC Section 8 compliant error codes and exceptions.
 from __future__ import annotations
 
 from enum import Enum
-from typing import Any
+from typing import Any, ClassVar
+
+import orjson
 
 
 class ErrorCode(str, Enum):
@@ -37,20 +39,67 @@ class AppError(Exception):
         message: Human-readable error message
         status_code: HTTP status code
         details: Additional error details (optional)
+
+    Subclasses with a fixed code declare ERROR_CODE, STATUS_CODE and
+    DEFAULT_MESSAGE. Whenever a class declares ERROR_CODE or DEFAULT_MESSAGE,
+    CODE_STR (the code's string value) and the serialized JSON body for the
+    default message are computed, so the error response path neither touches
+    the Enum nor re-serializes the common case.
     """
 
+    ERROR_CODE: ClassVar[ErrorCode]
+    STATUS_CODE: ClassVar[int]
+    DEFAULT_MESSAGE: ClassVar[str | None] = None
+    CODE_STR: ClassVar[str | None] = None
+    DEFAULT_BODY: ClassVar[bytes]
+    DEFAULT_CONTENT_LENGTH: ClassVar[bytes]
+
+    __slots__ = ("error_code", "message", "status_code", "details")
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        declares = "ERROR_CODE" in cls.__dict__ or "DEFAULT_MESSAGE" in cls.__dict__
+        if not declares or not hasattr(cls, "ERROR_CODE"):
+            return
+        cls.CODE_STR = cls.ERROR_CODE.value
+        cls.DEFAULT_BODY = orjson.dumps(
+            {"error_code": cls.CODE_STR, "message": cls.DEFAULT_MESSAGE, "details": None}
+        )
+        cls.DEFAULT_CONTENT_LENGTH = str(len(cls.DEFAULT_BODY)).encode("latin-1")
+
     def __init__(
         self,
         error_code: ErrorCode,
-        message: str,
+        message: str | None,
         status_code: int,
         details: dict[str, Any] | None = None,
     ) -> None:
+        if message is None:
+            # Resolved per call, so a subclass overriding only DEFAULT_MESSAGE
+            # gets its own text rather than the parent's default argument
+            message = self.DEFAULT_MESSAGE or ""
+        super().__init__(message)
         self.error_code = error_code
         self.message = message
         self.status_code = status_code
         self.details = details
-        super().__init__(self.message)
+
+    def __str__(self) -> str:
+        return self.message
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Subclass __init__ signatures differ from AppError's, so pickle by
+        # state rather than by replaying args through __init__
+        state = (self.error_code, self.message, self.status_code, self.details)
+        return (type(self).__new__, (type(self), self.message), state)
+
+    def __setstate__(self, state: tuple[Any, ...]) -> None:
+        self.error_code, self.message, self.status_code, self.details = state
+
+    @property
+    def has_default_body(self) -> bool:
+        """Whether DEFAULT_BODY is this error's serialized response body."""
+        return self.details is None and self.message == self.DEFAULT_MESSAGE
 
 
 # Trading Exceptions (SPEC Section 8.1)
@@ -59,15 +108,21 @@ class AppError(Exception):
 class InsufficientBalanceError(AppError):
     """Raised when user doesn't have enough balance for a transaction."""
 
+    ERROR_CODE = ErrorCode.INSUFFICIENT_BALANCE
+    STATUS_CODE = 400
+    DEFAULT_MESSAGE = "Insufficient balance for this transaction"
+
+    __slots__ = ()
+
     def __init__(
         self,
-        message: str = "Insufficient balance for this transaction",
+        message: str | None = None,
         details: dict[str, Any] | None = None,
     ) -> None:
         super().__init__(
-            error_code=ErrorCode.INSUFFICIENT_BALANCE,
+            error_code=self.ERROR_CODE,
             message=message,
-            status_code=400,
+            status_code=self.STATUS_CODE,
             details=details,
         )
 
@@ -75,15 +130,21 @@ class InsufficientBalanceError(AppError):
 class InsufficientPositionError(AppError):
     """Raised when user doesn't have enough position to sell."""
 
+    ERROR_CODE = ErrorCode.INSUFFICIENT_POSITION
+    STATUS_CODE = 400
+    DEFAULT_MESSAGE = "Insufficient position for this sale"
+
+    __slots__ = ()
+
     def __init__(
         self,
-        message: str = "Insufficient position for this sale",
+        message: str | None = None,
         details: dict[str, Any] | None = None,
     ) -> None:
         super().__init__(
-            error_code=ErrorCode.INSUFFICIENT_POSITION,
+            error_code=self.ERROR_CODE,
             message=message,
-            status_code=400,
+            status_code=self.STATUS_CODE,
             details=details,
         )
 
@@ -91,15 +152,21 @@ class InsufficientPositionError(AppError):
 class MarketNotOpenError(AppError):
     """Raised when trying to trade on a market that is not open."""
 
+    ERROR_CODE = ErrorCode.MARKET_NOT_OPEN
+    STATUS_CODE = 400
+    DEFAULT_MESSAGE = "Market is not open for trading"
+
+    __slots__ = ()
+
     def __init__(
         self,
-        message: str = "Market is not open for trading",
+        message: str | None = None,
         details: dict[str, Any] | None = None,
     ) -> None:
         super().__init__(
-            error_code=ErrorCode.MARKET_NOT_OPEN,
+            error_code=self.ERROR_CODE,
             message=message,
-            status_code=400,
+            status_code=self.STATUS_CODE,
             details=details,
         )
 
@@ -107,15 +174,21 @@ class MarketNotOpenError(AppError):
 class InvalidQuantityError(AppError):
     """Raised when an invalid quantity is specified."""
 
+    ERROR_CODE = ErrorCode.INVALID_QUANTITY
+    STATUS_CODE = 400
+    DEFAULT_MESSAGE = "Invalid quantity specified"
+
+    __slots__ = ()
+
     def __init__(
         self,
-        message: str = "Invalid quantity specified",
+        message: str | None = None,
         details: dict[str, Any] | None = None,
     ) -> None:
         super().__init__(
-            error_code=ErrorCode.INVALID_QUANTITY,
+            error_code=self.ERROR_CODE,
             message=message,
-            status_code=400,
+            status_code=self.STATUS_CODE,
             details=details,
         )
 
@@ -123,15 +196,21 @@ class InvalidQuantityError(AppError):
 class PriceBoundaryExceededError(AppError):
     """Raised when price would exceed allowed boundaries (0.1% - 99.9%)."""
 
+    ERROR_CODE = ErrorCode.PRICE_BOUNDARY_EXCEEDED
+    STATUS_CODE = 400
+    DEFAULT_MESSAGE = "Price boundary exceeded (allowed: 0.1% - 99.9%)"
+
+    __slots__ = ()
+
     def __init__(
         self,
-        message: str = "Price boundary exceeded (allowed: 0.1% - 99.9%)",
+        message: str | None = None,
         details: dict[str, Any] | None = None,
     ) -> None:
         super().__init__(
-            error_code=ErrorCode.PRICE_BOUNDARY_EXCEEDED,
+            error_code=self.ERROR_CODE,
             message=message,
-            status_code=400,
+            status_code=self.STATUS_CODE,
             details=details,
         )
 
@@ -142,15 +221,21 @@ class PriceBoundaryExceededError(AppError):
 class UnauthorizedError(AppError):
     """Raised when authentication is required but not provided."""
 
+    ERROR_CODE = ErrorCode.UNAUTHORIZED
+    STATUS_CODE = 401
+    DEFAULT_MESSAGE = "Authentication required"
+
+    __slots__ = ()
+
     def __init__(
         self,
-        message: str = "Authentication required",
+        message: str | None = None,
         details: dict[str, Any] | None = None,
     ) -> None:
         super().__init__(
-            error_code=ErrorCode.UNAUTHORIZED,
+            error_code=self.ERROR_CODE,
             message=message,
-            status_code=401,
+            status_code=self.STATUS_CODE,
             details=details,
         )
 
@@ -158,15 +243,21 @@ class UnauthorizedError(AppError):
 class ForbiddenError(AppError):
     """Raised when user doesn't have permission for the action."""
 
+    ERROR_CODE = ErrorCode.FORBIDDEN
+    STATUS_CODE = 403
+    DEFAULT_MESSAGE = "Permission denied"
+
+    __slots__ = ()
+
     def __init__(
         self,
-        message: str = "Permission denied",
+        message: str | None = None,
         details: dict[str, Any] | None = None,
     ) -> None:
         super().__init__(
-            error_code=ErrorCode.FORBIDDEN,
+            error_code=self.ERROR_CODE,
             message=message,
-            status_code=403,
+            status_code=self.STATUS_CODE,
             details=details,
         )
 
@@ -174,15 +265,21 @@ class ForbiddenError(AppError):
 class TokenExpiredError(AppError):
     """Raised when the authentication token has expired."""
 
+    ERROR_CODE = ErrorCode.TOKEN_EXPIRED
+    STATUS_CODE = 401
+    DEFAULT_MESSAGE = "Token has expired"
+
+    __slots__ = ()
+
     def __init__(
         self,
-        message: str = "Token has expired",
+        message: str | None = None,
         details: dict[str, Any] | None = None,
     ) -> None:
         super().__init__(
-            error_code=ErrorCode.TOKEN_EXPIRED,
+            error_code=self.ERROR_CODE,
             message=message,
-            status_code=401,
+            status_code=self.STATUS_CODE,
             details=details,
         )
 
@@ -193,15 +290,21 @@ class TokenExpiredError(AppError):
 class NotFoundError(AppError):
     """Raised when a requested resource is not found."""
 
+    ERROR_CODE = ErrorCode.NOT_FOUND
+    STATUS_CODE = 404
+    DEFAULT_MESSAGE = "Resource not found"
+
+    __slots__ = ()
+
     def __init__(
         self,
-        message: str = "Resource not found",
+        message: str | None = None,
         details: dict[str, Any] | None = None,
     ) -> None:
         super().__init__(
-            error_code=ErrorCode.NOT_FOUND,
+            error_code=self.ERROR_CODE,
             message=message,
-            status_code=404,
+            status_code=self.STATUS_CODE,
             details=details,
         )
 
@@ -209,15 +312,21 @@ class NotFoundError(AppError):
 class ValidationError(AppError):
     """Raised when input validation fails."""
 
+    ERROR_CODE = ErrorCode.VALIDATION_ERROR
+    STATUS_CODE = 422
+    DEFAULT_MESSAGE = "Validation error"
+
+    __slots__ = ()
+
     def __init__(
         self,
-        message: str = "Validation error",
+        message: str | None = None,
         details: dict[str, Any] | None = None,
     ) -> None:
         super().__init__(
-            error_code=ErrorCode.VALIDATION_ERROR,
+            error_code=self.ERROR_CODE,
             message=message,
-            status_code=422,
+            status_code=self.STATUS_CODE,
             details=details,
         )
 
@@ -225,14 +334,20 @@ class ValidationError(AppError):
 class InternalError(AppError):
     """Raised for internal server errors."""
 
+    ERROR_CODE = ErrorCode.INTERNAL_ERROR
+    STATUS_CODE = 500
+    DEFAULT_MESSAGE = "Internal server error"
+
+    __slots__ = ()
+
     def __init__(
         self,
-        message: str = "Internal server error",
+        message: str | None = None,
         details: dict[str, Any] | None = None,
     ) -> None:
         super().__init__(
-            error_code=ErrorCode.INTERNAL_ERROR,
+            error_code=self.ERROR_CODE,
             message=message,
-            status_code=500,
+            status_code=self.STATUS_CODE,
             details=details,
         )
@@ -13,8 +13,11 @@ Key formulas:
 from __future__ import annotations
 
 import math
+import sys
 from collections.abc import Sequence
-from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
 
 # Price boundaries (SPEC Section 3.3)
 # Prevent extreme prices that would make trading impractical
@@ -24,8 +27,30 @@ MAX_PRICE = Decimal("0.999")  # 99.9%
 # Precision for Decimal calculations
 PRECISION = Decimal("0.0001")
 
+# Shared zero so guards and early returns do not construct a Decimal per call
+_D_ZERO = Decimal("0")
+
+# Float64 copies of the price boundaries for the numerical core
+_MIN_PRICE_F64 = float(MIN_PRICE)
+_MAX_PRICE_F64 = float(MAX_PRICE)
+
+# Smallest normal float64; a smaller sum of e_i has lost its precision
+_F64_TINY = sys.float_info.min
+
+# Absolute cost tolerance for the share estimate solver
+_SOLVER_TOLERANCE = 1e-6
+
+# ln(K) for K = 2..31: the cost of a fresh (all-zero) market is b * ln(K)
+_LN_K = tuple(math.log(k) for k in range(2, 32))
+
+# Up to this many outcomes, is_trade_allowed checks bounds with a scalar loop
+_SCALAR_BOUNDS_MAX_OUTCOMES = 4
+
 
-def _validate_inputs(quantities: Sequence[Decimal], b: Decimal) -> None:
+def _validate_inputs(
+    quantities: Sequence[Decimal] | Sequence[float],
+    b: Decimal | float,
+) -> None:
     """Validate LMSR function inputs.
 
     Args:
@@ -38,34 +63,182 @@ def _validate_inputs(quantities: Sequence[Decimal], b: Decimal) -> None:
     if len(quantities) < 2:
         raise ValueError("Market must have at least 2 outcomes")
 
-    if b <= Decimal("0"):
+    if b <= _D_ZERO:
         raise ValueError("Liquidity parameter b must be positive")
 
 
-def _exp_scaled(q: Decimal, b: Decimal) -> Decimal:
-    """Calculate e^(q/b) with overflow protection.
+def _as_f64(quantities: Sequence[Decimal]) -> np.ndarray:
+    """Convert outcome quantities to a float64 array in one pass."""
+    return np.fromiter(
+        (float(q) for q in quantities), dtype=np.float64, count=len(quantities)
+    )
+
+
+def _to_decimal(value: float) -> Decimal:
+    """Convert a float result back to a quantized Decimal at the API boundary.
+
+    Goes through the shortest round-trip repr rather than Decimal(float): the
+    exact binary expansion is slower to build and would round ties such as
+    0.12345 differently. value must be a builtin float (see ndarray.tolist).
+    """
+    return Decimal(repr(value)).quantize(PRECISION, rounding=ROUND_HALF_UP)
+
 
-    Uses a scaling technique to prevent overflow for large q/b values.
+def _lmsr_state(qs: np.ndarray, b: float) -> tuple[np.ndarray, float, float]:
+    """Compute the shifted exponentials behind the LMSR cost and prices.
+
+    With s = q/b and m = max(s), every exponent s_i - m is <= 0 and cannot
+    overflow.
 
     Args:
-        q: Quantity value
+        qs: Outcome quantities as float64
         b: Liquidity parameter
 
     Returns:
-        e^(q/b) as Decimal, or a bounded value if overflow would occur
+        Tuple of (e, m, S) where e_i = e^(s_i - m) and S = Σ e_i
     """
-    try:
-        exponent = float(q / b)
-        # Clamp exponent to prevent overflow
-        # math.exp overflows around 709
-        if exponent > 700:
-            exponent = 700
-        elif exponent < -700:
-            return Decimal("0")
-        return Decimal(str(math.exp(exponent)))
-    except (OverflowError, InvalidOperation):
-        # Return max representable value for extreme cases
-        return Decimal("1e308") if q > 0 else Decimal("0")
+    scaled = qs / b
+    m = float(scaled.max())
+    e = np.exp(scaled - m)
+    return e, m, float(e.sum())
+
+
+def _lmsr_kernel(qs: np.ndarray, b: float) -> tuple[float, np.ndarray]:
+    """Compute the LMSR cost and prices in a single log-sum-exp pass.
+
+    C(q) = b * (m + ln(S)),  p_i = e_i / S  (see _lmsr_state). Binary
+    markets, the common case, take a specialized scalar path.
+
+    Args:
+        qs: Outcome quantities as float64
+        b: Liquidity parameter
+
+    Returns:
+        Tuple of (cost, prices)
+    """
+    if len(qs) == 2:
+        return _lmsr_kernel_binary(float(qs[0]) / b, float(qs[1]) / b, b)
+
+    e, m, total = _lmsr_state(qs, b)
+    return b * (m + math.log(total)), e / total
+
+
+def _lmsr_kernel_binary(s0: float, s1: float, b: float) -> tuple[float, np.ndarray]:
+    """Two-outcome (yes/no) specialization of _lmsr_kernel.
+
+    ln(e^s0 + e^s1) = max(s0, s1) + log1p(e^-|s0 - s1|), so one exp and one
+    log1p give both the cost and the (logistic) prices.
+
+    Args:
+        s0: q_0 / b
+        s1: q_1 / b
+        b: Liquidity parameter
+
+    Returns:
+        Tuple of (cost, prices)
+    """
+    t = math.exp(-abs(s0 - s1))
+    cost = b * (max(s0, s1) + math.log1p(t))
+    p_high = 1.0 / (1.0 + t)
+    p_low = t * p_high
+    if s0 >= s1:
+        return cost, np.array((p_high, p_low))
+    return cost, np.array((p_low, p_high))
+
+
+def _rest_sum(e: np.ndarray, total: float, k: int) -> float:
+    """Sum of the shifted exponentials of every outcome except k.
+
+    S - e_k cancels catastrophically when outcome k dominates the sum, so in
+    that case the other terms are summed directly.
+    """
+    e_k = float(e[k])
+    if e_k < 0.5 * total:
+        return total - e_k
+    return float(e[:k].sum() + e[k + 1 :].sum())
+
+
+def _lmsr_incremental(
+    qs: np.ndarray,
+    e: np.ndarray,
+    m: float,
+    total: float,
+    b: float,
+    k: int,
+    q_k_new: float,
+) -> tuple[float, float]:
+    """Re-evaluate the LMSR after changing only outcome k.
+
+    Reuses the cached state from _lmsr_state so a single-outcome change costs
+    one exp instead of N. The cached state is not modified. If every other
+    outcome's term underflowed against the old shift, they are lost from the
+    cache and the full kernel is run on the updated quantities instead.
+
+    Args:
+        qs: Baseline outcome quantities as float64
+        e: Shifted exponentials of the baseline state
+        m: Shift (max of q/b) of the baseline state
+        total: Sum of e for the baseline state
+        b: Liquidity parameter
+        k: Index of the changed outcome
+        q_k_new: New quantity for outcome k
+
+    Returns:
+        Tuple of (cost, price_k) after the change
+    """
+    s_new = q_k_new / b
+    rest = _rest_sum(e, total, k)
+    if rest < _F64_TINY:
+        q_new = qs.copy()
+        q_new[k] = q_k_new
+        cost, prices = _lmsr_kernel(q_new, b)
+        return cost, float(prices[k])
+    if s_new > m:
+        # Re-base the shift so the new exponent stays <= 0
+        rest *= math.exp(m - s_new)
+        m = s_new
+        e_k = 1.0
+    else:
+        e_k = math.exp(s_new - m)
+    total_new = rest + e_k
+    return b * (m + math.log(total_new)), e_k / total_new
+
+
+def _lmsr_cost_delta(
+    qs: np.ndarray,
+    e: np.ndarray,
+    m: float,
+    total: float,
+    b: float,
+    k: int,
+    q_k_new: float,
+) -> float:
+    """Compute C(q_new) - C(q) when only outcome k changes.
+
+    ΔC = b * ln(1 + (e_k_new - e_k) / S), evaluated with log1p so small
+    trades keep full precision and need one log instead of two. When the new
+    exponent would exceed the shift (e_k_new > 1, possibly overflowing), or
+    when outcome k dominates S (selling it would push the log1p argument to
+    -1), the difference of two re-based costs from _lmsr_incremental is used
+    instead.
+
+    Args:
+        qs: Baseline outcome quantities as float64
+        e: Shifted exponentials of the baseline state
+        m: Shift (max of q/b) of the baseline state
+        total: Sum of e for the baseline state
+        b: Liquidity parameter
+        k: Index of the changed outcome
+        q_k_new: New quantity for outcome k
+
+    Returns:
+        The cost difference as float
+    """
+    shifted = q_k_new / b - m
+    if shifted > 0.0 or float(e[k]) >= 0.5 * total:
+        cost_after, _ = _lmsr_incremental(qs, e, m, total, b, k, q_k_new)
+        return cost_after - b * (m + math.log(total))
+    return b * math.log1p((math.exp(shifted) - float(e[k])) / total)
 
 
 def cost_function(quantities: Sequence[Decimal], b: Decimal) -> Decimal:
@@ -90,21 +263,13 @@ def cost_function(quantities: Sequence[Decimal], b: Decimal) -> Decimal:
     """
     _validate_inputs(quantities, b)
 
-    # Calculate sum of e^(q_i/b) for all outcomes
-    # Use numerical stability technique: factor out max exponent
-    max_q = max(quantities)
-    scaled_sum = sum(
-        _exp_scaled(q - max_q, b)
-        for q in quantities
-    )
-
-    # C(q) = b * ln(Σ e^(q_i/b))
-    # = b * (max_q/b + ln(Σ e^((q_i - max_q)/b)))
-    # = max_q + b * ln(scaled_sum)
-    log_sum = Decimal(str(math.log(float(scaled_sum))))
-    cost = max_q + b * log_sum
+    # Opening quote: with every q_i = 0, C = b * ln(K) needs no exp/log at all
+    n = len(quantities)
+    if n - 2 < len(_LN_K) and not any(quantities):
+        return _to_decimal(float(b) * _LN_K[n - 2])
 
-    return cost.quantize(PRECISION, rounding=ROUND_HALF_UP)
+    cost, _ = _lmsr_kernel(_as_f64(quantities), float(b))
+    return _to_decimal(cost)
 
 
 def calculate_prices(
@@ -134,32 +299,45 @@ def calculate_prices(
     """
     _validate_inputs(quantities, b)
 
-    # Use log-sum-exp trick for numerical stability
-    max_q = max(quantities)
-    exp_values = [_exp_scaled(q - max_q, b) for q in quantities]
-    total = sum(exp_values)
+    prices = _prices_f64(_as_f64(quantities), float(b), apply_bounds)
+    return [_to_decimal(p) for p in prices.tolist()]
 
-    # Calculate raw probabilities
-    raw_prices = [exp_val / total for exp_val in exp_values]
 
-    if not apply_bounds:
-        return [p.quantize(PRECISION, rounding=ROUND_HALF_UP) for p in raw_prices]
+def calculate_prices_float(
+    quantities: Sequence[float],
+    b: float,
+    apply_bounds: bool = True,
+) -> np.ndarray:
+    """Float counterpart of calculate_prices for analytics and estimation.
 
-    # Apply price bounds and renormalize
-    bounded_prices = []
-    for price in raw_prices:
-        if price < MIN_PRICE:
-            bounded_prices.append(MIN_PRICE)
-        elif price > MAX_PRICE:
-            bounded_prices.append(MAX_PRICE)
-        else:
-            bounded_prices.append(price)
+    Skips the Decimal conversions at both ends; results are not quantized.
 
-    # Renormalize to ensure sum = 1.0 after bounding
-    bounded_total = sum(bounded_prices)
-    normalized_prices = [p / bounded_total for p in bounded_prices]
+    Args:
+        quantities: List of outcome quantities
+        b: Liquidity parameter
+        apply_bounds: Whether to apply MIN_PRICE/MAX_PRICE bounds
 
-    return [p.quantize(PRECISION, rounding=ROUND_HALF_UP) for p in normalized_prices]
+    Returns:
+        float64 array of prices for each outcome, summing to 1.0
+
+    Raises:
+        ValueError: If inputs are invalid
+    """
+    _validate_inputs(quantities, b)
+
+    return _prices_f64(np.asarray(quantities, dtype=np.float64), float(b), apply_bounds)
+
+
+def _prices_f64(qs: np.ndarray, b: float, apply_bounds: bool) -> np.ndarray:
+    """Shared float core of calculate_prices and calculate_prices_float."""
+    _, prices = _lmsr_kernel(qs, b)
+
+    if apply_bounds:
+        # Apply price bounds and renormalize to ensure sum = 1.0 after bounding
+        prices = np.clip(prices, _MIN_PRICE_F64, _MAX_PRICE_F64)
+        prices /= prices.sum()
+
+    return prices
 
 
 def calculate_trade_cost(
@@ -193,23 +371,52 @@ def calculate_trade_cost(
     if outcome_index < 0 or outcome_index >= len(quantities):
         raise ValueError(f"outcome_index {outcome_index} out of range")
 
-    if quantity_delta == Decimal("0"):
-        return Decimal("0")
+    if quantity_delta.is_zero():
+        return _D_ZERO
 
-    # Calculate cost before trade
-    cost_before = cost_function(quantities, b)
+    cost = _trade_cost_f64(_as_f64(quantities), outcome_index, float(quantity_delta), float(b))
+    return _to_decimal(cost)
 
-    # Calculate new quantities after trade
-    new_quantities = list(quantities)
-    new_quantities[outcome_index] = quantities[outcome_index] + quantity_delta
 
-    # Calculate cost after trade
-    cost_after = cost_function(new_quantities, b)
+def calculate_trade_cost_float(
+    quantities: Sequence[float],
+    outcome_index: int,
+    quantity_delta: float,
+    b: float,
+) -> float:
+    """Float counterpart of calculate_trade_cost for analytics and estimation.
 
-    # Trade cost = new cost - old cost
-    trade_cost = cost_after - cost_before
+    Args:
+        quantities: Current quantities for all outcomes
+        outcome_index: Index of the outcome being traded
+        quantity_delta: Change in quantity (positive for buy, negative for sell)
+        b: Liquidity parameter
+
+    Returns:
+        The unquantized cost of the trade
+
+    Raises:
+        ValueError: If inputs are invalid or outcome_index is out of range
+    """
+    _validate_inputs(quantities, b)
+
+    if outcome_index < 0 or outcome_index >= len(quantities):
+        raise ValueError(f"outcome_index {outcome_index} out of range")
 
-    return trade_cost.quantize(PRECISION, rounding=ROUND_HALF_UP)
+    if quantity_delta == 0:
+        return 0.0
+
+    qs = np.asarray(quantities, dtype=np.float64)
+    return _trade_cost_f64(qs, outcome_index, float(quantity_delta), float(b))
+
+
+def _trade_cost_f64(qs: np.ndarray, k: int, quantity_delta: float, b: float) -> float:
+    """Shared float core of calculate_trade_cost and calculate_trade_cost_float."""
+    e, m, total = _lmsr_state(qs, b)
+
+    # Only the traded outcome changes, so C(q_new) - C(q_old) is a single log1p
+    q_k_new = float(qs[k]) + quantity_delta
+    return _lmsr_cost_delta(qs, e, m, total, b, k, q_k_new)
 
 
 def is_trade_allowed(
@@ -247,8 +454,8 @@ def is_trade_allowed(
         return False, f"outcome_index {outcome_index} out of range"
 
     # Calculate new quantities after trade
-    new_quantities = list(quantities)
-    new_quantities[outcome_index] = quantities[outcome_index] + quantity_delta
+    qs = _as_f64(quantities)
+    qs[outcome_index] += float(quantity_delta)
 
     # Check if any new quantity would be negative (can't have negative shares overall)
     # Note: Individual positions can be negative (shorts), but market state can't be
@@ -256,18 +463,31 @@ def is_trade_allowed(
 
     # Calculate prices after trade without bounds
     try:
-        new_prices = calculate_prices(new_quantities, b, apply_bounds=False)
+        _, new_prices = _lmsr_kernel(qs, float(b))
     except (ValueError, OverflowError) as e:
         return False, f"Price calculation error: {e}"
 
-    # Check if any price would exceed boundaries
-    for i, price in enumerate(new_prices):
-        if price < MIN_PRICE:
-            return False, f"Trade would push outcome {i} price below minimum ({MIN_PRICE})"
-        if price > MAX_PRICE:
-            return False, f"Trade would push outcome {i} price above maximum ({MAX_PRICE})"
+    # Check if any price would exceed boundaries (no Decimal on the happy path)
+    if len(new_prices) <= _SCALAR_BOUNDS_MAX_OUTCOMES:
+        # Small markets: a plain loop beats NumPy's per-call dispatch overhead
+        for i, price in enumerate(new_prices.tolist()):
+            if price < _MIN_PRICE_F64 or price > _MAX_PRICE_F64:
+                return False, _bounds_violation_reason(i, price)
+        return True, None
+
+    out_of_bounds = (new_prices < _MIN_PRICE_F64) | (new_prices > _MAX_PRICE_F64)
+    if not out_of_bounds.any():
+        return True, None
+
+    i = int(out_of_bounds.argmax())
+    return False, _bounds_violation_reason(i, float(new_prices[i]))
 
-    return True, None
+
+def _bounds_violation_reason(outcome_index: int, price: float) -> str:
+    """Build the rejection message for a price outside the SPEC bounds."""
+    if price < _MIN_PRICE_F64:
+        return f"Trade would push outcome {outcome_index} price below minimum ({MIN_PRICE})"
+    return f"Trade would push outcome {outcome_index} price above maximum ({MAX_PRICE})"
 
 
 def estimate_shares_for_cost(
@@ -279,41 +499,68 @@ def estimate_shares_for_cost(
 ) -> Decimal:
     """Estimate how many shares can be bought for a given cost.
 
-    Uses binary search to find the quantity that results in approximately
-    the target cost.
+    Solves cost(x) = target_cost with Newton's method on floats. The trade
+    cost is convex and increasing in x with derivative price_k, so Newton
+    converges in a handful of steps; a step that leaves the bracket around
+    the root falls back to bisection. Since x + b * ln(p_k) <= cost(x) <= x,
+    the root lies in [target, target - b * ln(p_k)], which stays finite
+    even for a very cheap outcome.
 
     Args:
         quantities: Current quantities for all outcomes
         outcome_index: Index of the outcome to buy
         target_cost: Maximum cost willing to pay
         b: Liquidity parameter
-        max_iterations: Maximum iterations for binary search
+        max_iterations: Maximum solver iterations
 
     Returns:
-        Estimated number of shares that can be bought
+        Estimated number of shares that can be bought; if the solver does not
+        converge, the largest quantity found that costs at most target_cost
 
     Raises:
         ValueError: If inputs are invalid
     """
     _validate_inputs(quantities, b)
 
-    if target_cost <= Decimal("0"):
-        return Decimal("0")
+    if outcome_index < 0 or outcome_index >= len(quantities):
+        raise ValueError(f"outcome_index {outcome_index} out of range")
+
+    if target_cost <= _D_ZERO:
+        return _D_ZERO
+
+    # Baseline state is computed once; each step only re-evaluates outcome k
+    b_f64 = float(b)
+    target = float(target_cost)
+    qs = _as_f64(quantities)
+    e, m, total = _lmsr_state(qs, b_f64)
+    cost_before = b_f64 * (m + math.log(total))
+    q_k = float(qs[outcome_index])
+    price_k = float(e[outcome_index]) / total
+    # ln(p_k) from the exponent, so it stays finite when p_k underflows
+    log_price_k = q_k / b_f64 - m - math.log(total)
 
-    # Binary search for quantity
-    low = Decimal("0")
-    high = target_cost * Decimal("10")  # Upper bound estimate
+    # cost(low) <= target <= cost(high); first Newton step from x = 0
+    low, high = target, target - b_f64 * log_price_k
+    x = min(target / price_k, high) if price_k > 0 else high
 
     for _ in range(max_iterations):
-        mid = (low + high) / Decimal("2")
-        cost = calculate_trade_cost(quantities, outcome_index, mid, b)
+        cost_after, price_k = _lmsr_incremental(
+            qs, e, m, total, b_f64, outcome_index, q_k + x
+        )
+        residual = cost_after - cost_before - target
 
-        if abs(cost - target_cost) < PRECISION:
-            return mid.quantize(PRECISION, rounding=ROUND_HALF_UP)
+        if abs(residual) < _SOLVER_TOLERANCE:
+            return _to_decimal(x)
 
-        if cost < target_cost:
-            low = mid
+        if residual > 0:
+            high = x
         else:
-            high = mid
+            low = x
+
+        step = x - residual / price_k if price_k > 0 else math.nan
+        if not low < step < high:
+            # Newton left the bracket (or the slope vanished): bisect
+            step = (low + high) / 2
+        x = step
 
-    return low.quantize(PRECISION, rounding=ROUND_HALF_UP)
+    return _to_decimal(low)
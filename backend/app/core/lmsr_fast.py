@@ -0,0 +1,136 @@
+"""
+Batched LMSR evaluation for many markets at once.
+SPEC Section 3.3 compliant.
+
+Evaluates the cost function and prices for an (M markets x N outcomes)
+batch in a single call, e.g. for backtests or replaying a trade feed.
+When numba is installed the kernel is JIT-compiled and parallelized over
+markets; otherwise a vectorized NumPy implementation is used.
+"""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from app.core.lmsr import MAX_PRICE, MIN_PRICE
+
+try:
+    from numba import njit, prange  # type: ignore[import]
+except ImportError:  # pragma: no cover - depends on the environment
+    njit = None
+
+NUMBA_AVAILABLE = njit is not None
+
+# Float64 copies of the SPEC price boundaries
+_MIN_PRICE_F64 = float(MIN_PRICE)
+_MAX_PRICE_F64 = float(MAX_PRICE)
+
+
+def _lmsr_batch_numpy(
+    q: np.ndarray,
+    b: np.ndarray,
+    cost_out: np.ndarray,
+    prices_out: np.ndarray,
+) -> None:
+    """Vectorized NumPy batch kernel (row-wise log-sum-exp)."""
+    scaled = q / b[:, None]
+    m = scaled.max(axis=1)
+    np.exp(scaled - m[:, None], out=prices_out)
+    total = prices_out.sum(axis=1)
+    prices_out /= total[:, None]
+    np.multiply(b, m + np.log(total), out=cost_out)
+
+
+if NUMBA_AVAILABLE:  # pragma: no cover - depends on the environment
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _lmsr_batch_numba(
+        q: np.ndarray,
+        b: np.ndarray,
+        cost_out: np.ndarray,
+        prices_out: np.ndarray,
+    ) -> None:
+        """Numba batch kernel: one fused pass per market, markets in parallel."""
+        n_markets, n_outcomes = q.shape
+        for i in prange(n_markets):
+            m = q[i, 0] / b[i]
+            for j in range(1, n_outcomes):
+                s = q[i, j] / b[i]
+                if s > m:
+                    m = s
+            total = 0.0
+            for j in range(n_outcomes):
+                e = math.exp(q[i, j] / b[i] - m)
+                prices_out[i, j] = e
+                total += e
+            for j in range(n_outcomes):
+                prices_out[i, j] /= total
+            cost_out[i] = b[i] * (m + math.log(total))
+
+    _lmsr_batch_kernel = _lmsr_batch_numba
+else:
+    _lmsr_batch_kernel = _lmsr_batch_numpy
+
+
+def lmsr_batch(
+    quantities: np.ndarray,
+    b: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Calculate LMSR costs and prices for a batch of markets.
+
+    Args:
+        quantities: Outcome quantities, shape (M, N) with N >= 2
+        b: Liquidity parameter per market, shape (M,)
+
+    Returns:
+        Tuple of (costs, prices) with shapes (M,) and (M, N), as float64
+
+    Raises:
+        ValueError: If shapes are inconsistent or any b is not positive
+
+    Example:
+        >>> costs, prices = lmsr_batch(np.zeros((3, 2)), np.full(3, 100.0))
+    """
+    q = np.ascontiguousarray(quantities, dtype=np.float64)
+    b_arr = np.ascontiguousarray(b, dtype=np.float64)
+
+    if q.ndim != 2 or q.shape[1] < 2:
+        raise ValueError("quantities must have shape (markets, outcomes) with at least 2 outcomes")
+    if b_arr.shape != (q.shape[0],):
+        raise ValueError("b must have one liquidity parameter per market")
+    if (b_arr <= 0).any():
+        raise ValueError("Liquidity parameter b must be positive")
+
+    costs = np.empty(q.shape[0], dtype=np.float64)
+    prices = np.empty_like(q)
+    _lmsr_batch_kernel(q, b_arr, costs, prices)
+    return costs, prices
+
+
+def calculate_prices_batch(
+    quantities: np.ndarray,
+    b: np.ndarray,
+    apply_bounds: bool = True,
+) -> np.ndarray:
+    """Calculate prices for a batch of markets, e.g. to re-quote every open market.
+
+    Row-wise equivalent of calculate_prices, as float64: bounded prices are
+    clipped to MIN_PRICE/MAX_PRICE and renormalized in place.
+
+    Args:
+        quantities: Outcome quantities, shape (M, N) with N >= 2
+        b: Liquidity parameter per market, shape (M,)
+        apply_bounds: Whether to apply MIN_PRICE/MAX_PRICE bounds
+
+    Returns:
+        Prices with shape (M, N); each row sums to 1.0
+
+    Raises:
+        ValueError: If shapes are inconsistent or any b is not positive
+    """
+    _, prices = lmsr_batch(quantities, b)
+    if apply_bounds:
+        np.clip(prices, _MIN_PRICE_F64, _MAX_PRICE_F64, out=prices)
+        prices /= prices.sum(axis=1, keepdims=True)
+    return prices
@@ -14,14 +14,10 @@ from enum import Enum
 from typing import Any
 
 from fastapi import Depends
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from app.core.auth import decode_access_token
+from app.core.auth import decode_access_token, security
 from app.core.exceptions import ForbiddenError, UnauthorizedError
 
-# HTTP Bearer token security scheme
-security = HTTPBearer(auto_error=False)
-
 
 class UserRole(str, Enum):
     """User roles as defined in SPEC Section 4."""
@@ -38,6 +34,14 @@ ROLE_HIERARCHY: dict[UserRole, int] = {
     UserRole.ADMIN: 3,
 }
 
+# Same hierarchy keyed by the raw role string carried in JWT claims
+ROLE_HIERARCHY_BY_STR: dict[str, int] = {
+    role.value: level for role, level in ROLE_HIERARCHY.items()
+}
+
+# Level assumed for unknown role strings (treated as user)
+_DEFAULT_ROLE_LEVEL = ROLE_HIERARCHY[UserRole.USER]
+
 
 def has_required_role(user_role: UserRole, required_role: UserRole) -> bool:
     """Check if user has the required role permission.
@@ -57,8 +61,25 @@ def has_required_role(user_role: UserRole, required_role: UserRole) -> bool:
     return user_level >= required_level
 
 
+def has_required_role_str(user_role: str, required_level: int) -> bool:
+    """Check a raw role string against a precomputed hierarchy level.
+
+    String-keyed counterpart of has_required_role for the request path: no
+    UserRole construction and a single dict lookup. Unknown roles are
+    treated as user.
+
+    Args:
+        user_role: The user's role as found in the token claims
+        required_level: Minimum ROLE_HIERARCHY level required
+
+    Returns:
+        True if user has sufficient permissions, False otherwise
+    """
+    return ROLE_HIERARCHY_BY_STR.get(user_role, _DEFAULT_ROLE_LEVEL) >= required_level
+
+
 async def get_current_user_data(
-    credentials: HTTPAuthorizationCredentials | None = Depends(security),
+    token: str | None = Depends(security),
 ) -> dict[str, Any]:
     """FastAPI dependency to get current user data from JWT token.
 
@@ -66,7 +87,7 @@ async def get_current_user_data(
     In production, this would fetch the full user from the database.
 
     Args:
-        credentials: HTTP Bearer credentials from request header
+        token: Bearer token from the Authorization header
 
     Returns:
         Dictionary containing user data
@@ -74,10 +95,10 @@ async def get_current_user_data(
     Raises:
         UnauthorizedError: If no token provided or token is invalid
     """
-    if credentials is None:
+    if token is None:
         raise UnauthorizedError(message="Authentication required")
 
-    payload = decode_access_token(credentials.credentials)
+    payload = decode_access_token(token)
     user_id = payload.get("sub")
 
     if user_id is None:
@@ -128,6 +149,7 @@ class RoleChecker:
         # This means if both MODERATOR and ADMIN are specified,
         # MODERATOR level is the minimum requirement
         self.required_role = min(roles, key=lambda r: ROLE_HIERARCHY.get(r, 0))
+        self._required_level = ROLE_HIERARCHY[self.required_role]
 
     async def __call__(
         self,
@@ -146,13 +168,12 @@ class RoleChecker:
         """
         user_role_str = user_data.get("role", "user")
 
-        try:
-            user_role = UserRole(user_role_str)
-        except ValueError:
-            # Unknown role, treat as user
-            user_role = UserRole.USER
-
-        if not has_required_role(user_role, self.required_role):
+        if not has_required_role_str(user_role_str, self._required_level):
+            user_role = (
+                UserRole(user_role_str)
+                if user_role_str in ROLE_HIERARCHY_BY_STR
+                else UserRole.USER
+            )
             raise ForbiddenError(
                 message=f"Permission denied. Required role: {self.required_role.value}",
                 details={
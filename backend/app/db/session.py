@@ -2,20 +2,66 @@
 Async database session utilities.
 """
 from collections.abc import AsyncIterator
+from typing import Any
 
+from sqlalchemy.engine import URL, make_url
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 
 
-def create_engine(database_url: str | None = None) -> AsyncEngine:
-    """Create an async SQLAlchemy engine."""
-    return create_async_engine(database_url or settings.database_url, future=True)
+def _engine_options(url: URL) -> dict[str, Any]:
+    """Build connection pool options for the given database URL.
+
+    SQLite connections are cheap and file/memory bound, so pooling is disabled.
+    Other backends get a tuned QueuePool; LIFO checkout keeps the working set of
+    connections small so idle ones can be recycled by the server, and pre-ping
+    is opt-in since it adds a round-trip to every checkout. asyncpg
+    connections also get sized prepared statement caches so repeated queries
+    skip server-side parsing, and JIT is disabled per session unless enabled.
+    """
+    if url.get_backend_name() == "sqlite":
+        # NullPool opens a fresh connection per checkout, so there is nothing to
+        # pre-ping or recycle. Connections may be used from a thread other than
+        # the one that created them (aiosqlite worker, TestClient portal).
+        return {
+            "poolclass": NullPool,
+            "connect_args": {"check_same_thread": False},
+        }
+
+    options: dict[str, Any] = {
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_pool_overflow,
+        "pool_timeout": settings.database_pool_timeout,
+        "pool_recycle": settings.database_pool_recycle,
+        "pool_pre_ping": settings.database_pool_pre_ping,
+        "pool_use_lifo": settings.database_pool_use_lifo,
+    }
+    if url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            # asyncpg's own statement cache
+            "statement_cache_size": settings.database_statement_cache_size,
+            # SQLAlchemy's asyncpg adapter cache of prepared statements
+            "prepared_statement_cache_size": settings.database_prepared_statement_cache_size,
+            "server_settings": {"jit": "on" if settings.database_jit else "off"},
+        }
+    return options
+
+
+def create_engine(database_url: str | URL | None = None) -> AsyncEngine:
+    """Create an async SQLAlchemy engine.
+
+    The URL is parsed once and the same URL object is used both to pick the
+    pool options and to build the engine.
+    """
+    url = make_url(database_url or settings.database_url)
+    return create_async_engine(url, future=True, **_engine_options(url))
 
 
 engine: AsyncEngine = create_engine()
@@ -0,0 +1,44 @@
+"""
+Custom SQLAlchemy column types.
+"""
+from __future__ import annotations
+
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any
+
+from sqlalchemy import BigInteger
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import TypeDecorator
+
+
+class FixedPoint(TypeDecorator[Decimal]):
+    """Fixed-point Decimal stored as a BIGINT count of minor units.
+
+    The application keeps working with Decimal, while the database stores an
+    8-byte integer instead of a text-encoded NUMERIC. With scale=2, Decimal
+    ("1000.00") is stored as 100000.
+
+    Args:
+        scale: Number of decimal places kept (values are rounded half-up)
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def __init__(self, scale: int = 2, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.scale = scale
+        self._quantum = Decimal(1).scaleb(-scale)
+
+    def process_bind_param(self, value: Decimal | None, dialect: Dialect) -> int | None:
+        """Convert a Decimal to minor units."""
+        if value is None:
+            return None
+        quantized = Decimal(value).quantize(self._quantum, rounding=ROUND_HALF_UP)
+        return int(quantized.scaleb(self.scale))
+
+    def process_result_value(self, value: int | None, dialect: Dialect) -> Decimal | None:
+        """Convert minor units back to a Decimal with the configured scale."""
+        if value is None:
+            return None
+        return Decimal(value).scaleb(-self.scale)
@@ -3,6 +3,7 @@ FastAPI Application Entry Point
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.auth import router as auth_router
 from app.api.categories import router as categories_router
@@ -11,7 +12,8 @@ from app.core.error_handlers import register_exception_handlers
 app = FastAPI(
     title="Market Prediction API",
     description="Internal Prediction Market System API",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Register exception handlers
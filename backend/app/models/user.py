@@ -8,11 +8,12 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import DateTime, Numeric, String, func
+from sqlalchemy import DateTime, String, func
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
+from app.db.types import FixedPoint
 
 
 class User(Base):
@@ -30,6 +31,9 @@ class User(Base):
     """
 
     __tablename__ = "users"
+    # Fetch server-generated columns (created_at, updated_at) with
+    # INSERT/UPDATE ... RETURNING instead of a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[uuid.UUID] = mapped_column(
         PG_UUID(as_uuid=True),
@@ -42,11 +46,12 @@ class User(Base):
         String(50), nullable=False, default="user", server_default="user"
     )
     department: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    # Stored as BIGINT hundredths (1000.00 -> 100000), exposed as Decimal
     balance: Mapped[Decimal] = mapped_column(
-        Numeric(12, 2),
+        FixedPoint(2),
         nullable=False,
         default=Decimal("1000.00"),
-        server_default="1000.00",
+        server_default="100000",
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
@@ -6,7 +6,7 @@ from __future__ import annotations
 
 import asyncio
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import AsyncSessionLocal
@@ -46,31 +46,29 @@ async def seed_categories(db: AsyncSession) -> list[Category]:
     Returns:
         List of created or existing categories
     """
-    categories: list[Category] = []
+    names = [cat_data["name"] for cat_data in INITIAL_CATEGORIES]
 
-    for cat_data in INITIAL_CATEGORIES:
-        # Check if category already exists
-        result = await db.execute(
-            select(Category).where(Category.name == cat_data["name"])
-        )
-        existing = result.scalar_one_or_none()
+    # One query for all existing categories
+    result = await db.execute(select(Category).where(Category.name.in_(names)))
+    existing = {category.name: category for category in result.scalars()}
 
-        if existing:
+    new_rows = []
+    for cat_data in INITIAL_CATEGORIES:
+        if cat_data["name"] in existing:
             print(f"Category '{cat_data['name']}' already exists, skipping")
-            categories.append(existing)
         else:
-            category = Category(**cat_data)
-            db.add(category)
-            categories.append(category)
+            new_rows.append(cat_data)
             print(f"Creating category '{cat_data['name']}'")
 
-    await db.commit()
+    # One INSERT ... RETURNING for all new categories
+    created: dict[str, Category] = {}
+    if new_rows:
+        result = await db.execute(insert(Category).returning(Category), new_rows)
+        created = {category.name: category for category in result.scalars()}
 
-    # Refresh all categories
-    for cat in categories:
-        await db.refresh(cat)
+    await db.commit()
 
-    return categories
+    return [existing.get(name) or created[name] for name in names]
 
 
 async def main() -> None:
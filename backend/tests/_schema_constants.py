@@ -0,0 +1,9 @@
+"""
+Schema expectations shared by the model and migration tests.
+"""
+from __future__ import annotations
+
+# users table columns required by SPEC Section 4
+EXPECTED_USER_COLUMNS = frozenset(
+    {"id", "email", "name", "role", "department", "balance", "created_at", "updated_at"}
+)
@@ -0,0 +1,174 @@
+"""
+Shared pytest fixtures.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Annotated, Any
+
+import pytest
+from alembic.config import Config
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  (register all tables on Base.metadata)
+from alembic import command
+from app.api.auth import router as auth_router
+from app.core.auth import get_current_user_id
+from app.core.error_handlers import register_exception_handlers
+from app.db.base import Base
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - uvloop is not available on Windows
+    uvloop = None
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    """Run async tests on uvloop when it is installed.
+
+    uvloop ships with uvicorn[standard]; elsewhere the default policy is used.
+    """
+    if uvloop is not None:
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
+
+
+# Durability is pointless for throwaway test databases: skip fsyncs and keep
+# the rollback journal and temp tables in memory.
+_SQLITE_TEST_PRAGMAS = (
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+@event.listens_for(Engine, "connect")
+def _sqlite_test_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    """Apply the test PRAGMAs to every SQLite connection opened by the suite.
+
+    Listening on the Engine class also covers the engines Alembic's env.py
+    and the migration tests create for their file-backed databases.
+    """
+    # sqlite3.Connection or SQLAlchemy's aiosqlite adapter
+    if "sqlite" not in type(dbapi_connection).__module__:
+        return
+    cursor = dbapi_connection.cursor()
+    for pragma in _SQLITE_TEST_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+@pytest.fixture(scope="session")
+def alembic_config() -> Config:
+    """Alembic config parsed from alembic.ini once per test session.
+
+    Callers point it at their database with set_main_option("sqlalchemy.url",
+    ...) before each command. Tests in one process run sequentially, and
+    pytest-xdist workers are separate processes, so sharing it is safe.
+    """
+    return Config(str(Path(__file__).resolve().parents[1] / "alembic.ini"))
+
+
+@pytest.fixture(scope="session")
+def migrated_db_template(
+    alembic_config: Config, tmp_path_factory: pytest.TempPathFactory
+) -> Path:
+    """SQLite file upgraded to Alembic head once per test session.
+
+    Tests that only inspect the migrated schema copy this file instead of
+    re-running every revision.
+    """
+    path = tmp_path_factory.mktemp("alembic") / "template.db"
+    alembic_config.set_main_option("sqlalchemy.url", f"sqlite+aiosqlite:///{path}")
+    command.upgrade(alembic_config, "head")
+    return path
+
+
+@pytest.fixture(scope="session")
+async def engine() -> AsyncIterator[AsyncEngine]:
+    """In-memory SQLite engine with the schema created once per test session.
+
+    StaticPool keeps a single connection so the in-memory database survives
+    between checkouts. pysqlite's implicit transaction handling is replaced by
+    explicit BEGINs so per-test SAVEPOINTs behave as on a real server. Under
+    pytest-xdist every worker is its own process and so gets its own database.
+    """
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_implicit_begin(dbapi_connection: Any, connection_record: Any) -> None:
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn: Any) -> None:
+        conn.exec_driver_sql("BEGIN")
+
+    # The database is brand new, so skip create_all's per-table existence checks
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, checkfirst=False)
+
+    yield engine
+
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db_session(engine: AsyncEngine) -> AsyncIterator[AsyncSession]:
+    """Session whose work is rolled back after each test.
+
+    The session joins an outer transaction and turns its own commits into
+    SAVEPOINT releases, so tests (and the endpoints they call) can commit
+    freely without leaking rows into later tests.
+    """
+    conn = await engine.connect()
+    trans = await conn.begin()
+    session = AsyncSession(
+        bind=conn,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+    try:
+        yield session
+    finally:
+        await session.close()
+        await trans.rollback()
+        await conn.close()
+
+
+@pytest.fixture(scope="session")
+def auth_app() -> FastAPI:
+    """FastAPI app with exception handlers, the auth router and a /protected route.
+
+    Built once per test session; tests that need different behaviour should use
+    dependency_overrides and clear them afterwards.
+    """
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.include_router(auth_router, prefix="/api/v1/auth")
+
+    @app.get("/protected")
+    async def protected_endpoint(
+        current_user_id: Annotated[str, Depends(get_current_user_id)],
+    ) -> dict[str, str]:
+        return {"user_id": current_user_id}
+
+    return app
+
+
+@pytest.fixture(scope="session")
+async def auth_client(auth_app: FastAPI) -> AsyncIterator[AsyncClient]:
+    """Async client that calls auth_app on the test event loop."""
+    transport = ASGITransport(app=auth_app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
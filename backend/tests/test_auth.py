@@ -3,43 +3,87 @@ Tests for authentication module - SPEC Section 5 compliance.
 """
 from __future__ import annotations
 
+import itertools
+import time
 from datetime import timedelta
 from uuid import uuid4
 
+import jwt
 import pytest
-from fastapi import FastAPI, status
-from fastapi.testclient import TestClient
+from fastapi import status
+from httpx import AsyncClient
 
+from app.api import auth as auth_api
+from app.core import auth as auth_module
 from app.core.auth import (
     create_access_token,
     decode_access_token,
 )
 from app.core.exceptions import TokenExpiredError, UnauthorizedError
 
+# Rejections from the auth dependency (422: FastAPI validation error in some cases)
+_AUTH_FAIL_CODES = frozenset(
+    {status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN, status.HTTP_422_UNPROCESSABLE_CONTENT}
+)
+# Mock login either answers directly or redirects to the callback
+_LOGIN_OK_CODES = frozenset(
+    {status.HTTP_200_OK, status.HTTP_302_FOUND, status.HTTP_307_TEMPORARY_REDIRECT}
+)
+
+
+@pytest.fixture(scope="class")
+def subject() -> str:
+    """A token subject generated once per test class."""
+    return uuid4().hex
+
+
+@pytest.fixture(scope="class")
+def valid_token() -> tuple[str, str]:
+    """A (user_id, token) pair signed once per test class."""
+    user_id = uuid4().hex
+    return user_id, create_access_token(subject=user_id)
+
 
 class TestJWTToken:
     """Test JWT token generation and verification."""
 
-    def test_create_access_token_returns_string(self) -> None:
+    def test_create_access_token_returns_string(self, subject: str) -> None:
         """create_access_token should return a JWT string."""
-        user_id = uuid4()
-        token = create_access_token(subject=str(user_id))
+        token = create_access_token(subject=subject)
         assert isinstance(token, str)
         assert len(token) > 0
 
-    def test_create_access_token_with_custom_expiry(self) -> None:
+    def test_create_access_token_with_custom_expiry(self, subject: str) -> None:
         """create_access_token should accept custom expiry time."""
-        user_id = uuid4()
         expires_delta = timedelta(hours=2)
-        token = create_access_token(subject=str(user_id), expires_delta=expires_delta)
+        token = create_access_token(subject=subject, expires_delta=expires_delta)
         assert isinstance(token, str)
 
-    def test_decode_access_token_returns_payload(self) -> None:
+    @pytest.mark.parametrize("token_subject", ["user-1", "ユーザー-1"])
+    def test_create_access_token_matches_pyjwt_encoding(
+        self, token_subject: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Tokens should be exactly what jwt.encode produces, non-ASCII subjects included."""
+        monkeypatch.setattr(auth_module.time, "time", lambda: 1_700_000_000.5)
+        token = create_access_token(subject=token_subject, expires_delta=timedelta(minutes=5))
+
+        expected = jwt.encode(
+            {"sub": token_subject, "exp": 1_700_000_300, "iat": 1_700_000_000},
+            auth_module._JWT_SECRET,
+            algorithm=auth_module._JWT_ALG,
+        )
+        assert token == expected
+
+    def test_create_access_token_with_additional_claims(self, subject: str) -> None:
+        """Additional claims should be signed into the token."""
+        token = create_access_token(subject=subject, additional_claims={"role": "admin"})
+        assert decode_access_token(token)["role"] == "admin"
+
+    def test_decode_access_token_returns_payload(self, valid_token: tuple[str, str]) -> None:
         """decode_access_token should return the token payload."""
-        user_id = uuid4()
-        token = create_access_token(subject=str(user_id))
+        user_id, token = valid_token
         payload = decode_access_token(token)
-        assert payload["sub"] == str(user_id)
+        assert payload["sub"] == user_id
         assert "exp" in payload
 
     def test_decode_access_token_with_invalid_token_raises_error(self) -> None:
@@ -47,118 +91,235 @@ class TestJWTToken:
         with pytest.raises(UnauthorizedError):
             decode_access_token("invalid.token.here")
 
-    def test_decode_access_token_with_expired_token_raises_error(self) -> None:
+    def test_decode_access_token_with_expired_token_raises_error(self, subject: str) -> None:
         """decode_access_token should raise TokenExpiredError for expired token."""
-        user_id = uuid4()
         # Create a token that expires immediately
         token = create_access_token(
-            subject=str(user_id),
+            subject=subject,
             expires_delta=timedelta(seconds=-1),
         )
         with pytest.raises(TokenExpiredError):
             decode_access_token(token)
 
+    @pytest.mark.parametrize("algorithm", ["HS384", "HS512", "none"])
+    def test_decode_rejects_algorithms_other_than_configured(
+        self, algorithm: str, subject: str
+    ) -> None:
+        """Only the configured algorithm should be accepted, whatever the header says."""
+        key = None if algorithm == "none" else b"k" * 64
+        token = jwt.encode(
+            {"sub": subject, "exp": 9999999999},
+            key,
+            algorithm=algorithm,
+        )
+        with pytest.raises(UnauthorizedError):
+            decode_access_token(token)
+
 
-class TestAuthAPI:
-    """Test Auth API endpoints (SPEC Section 5)."""
+class TestDecodeCache:
+    """Test caching of verified token payloads."""
+
+    def test_repeated_decode_skips_verification(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A cached token should not be verified again."""
+        token = create_access_token(subject=str(uuid4()))
+        first = decode_access_token(token)
+
+        def fail_decode(*args: object, **kwargs: object) -> None:
+            raise AssertionError("jwt.decode should not be called for a cached token")
+
+        monkeypatch.setattr(auth_module.jwt, "decode", fail_decode)
+        assert decode_access_token(token) == first
+
+    def test_self_issued_token_decodes_without_verification(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Tokens minted by this process should be served from the cache."""
+        subject = str(uuid4())
+        token = create_access_token(subject=subject)
+
+        def fail_decode(*args: object, **kwargs: object) -> None:
+            raise AssertionError("jwt.decode should not be called for a self-issued token")
+
+        monkeypatch.setattr(auth_module.jwt, "decode", fail_decode)
+        assert decode_access_token(token)["sub"] == subject
+
+    def test_tampered_self_issued_token_is_still_verified(self) -> None:
+        """Only the exact minted token string should bypass verification."""
+        token = create_access_token(subject=str(uuid4()))
+        header, payload, signature = token.split(".")
+        tampered = f"{header}.{payload}.{signature[::-1]}"
+        with pytest.raises(UnauthorizedError):
+            decode_access_token(tampered)
+
+    def test_cached_payload_cannot_be_mutated_by_callers(self) -> None:
+        """Mutating a returned payload should not affect later decodes."""
+        subject = str(uuid4())
+        token = create_access_token(subject=subject)
+
+        decode_access_token(token)["sub"] = "tampered"
+        assert decode_access_token(token)["sub"] == subject
+
+    def test_cache_entry_does_not_outlive_token(self) -> None:
+        """Cached entries should expire no later than the token's exp claim."""
+        token = create_access_token(subject=str(uuid4()), expires_delta=timedelta(seconds=5))
+        payload = decode_access_token(token)
+        cache_expires_at, _ = auth_module._decode_cache[auth_module._cache_key(token)]
+        assert cache_expires_at <= payload["exp"]
+
+    def test_token_without_exp_is_accepted_and_cached_for_ttl(self) -> None:
+        """A signed token without an exp claim should decode and be cached for the TTL."""
+        subject = str(uuid4())
+        token = jwt.encode(
+            {"sub": subject}, auth_module._JWT_SECRET, algorithm=auth_module._JWT_ALG
+        )
+
+        assert decode_access_token(token)["sub"] == subject
+        cache_expires_at, _ = auth_module._decode_cache[auth_module._cache_key(token)]
+        assert cache_expires_at <= time.time() + auth_module._DECODE_CACHE_TTL
+
+    def test_invalid_token_is_not_cached(self) -> None:
+        """Tokens that fail verification should not be cached."""
+        with pytest.raises(UnauthorizedError):
+            decode_access_token("invalid.token.here")
+        assert auth_module._cache_key("invalid.token.here") not in auth_module._decode_cache
 
-    @pytest.fixture
-    def app(self) -> FastAPI:
-        """Create test FastAPI app with auth routes."""
-        from app.api.auth import router as auth_router
-        from app.core.error_handlers import register_exception_handlers
+    def test_raw_token_is_not_kept_in_cache(self) -> None:
+        """The cache should be keyed by token digest, not the bearer token itself."""
+        token = create_access_token(subject=str(uuid4()))
+        decode_access_token(token)
+        assert token not in auth_module._decode_cache
+        assert auth_module._cache_key(token) in auth_module._decode_cache
 
-        app = FastAPI()
-        register_exception_handlers(app)
-        app.include_router(auth_router, prefix="/api/v1/auth")
-        return app
+    @pytest.mark.parametrize("token", ["not-a-jwt-token-at-all", "a.b", "x" * 40 + ".y.z.w"])
+    def test_malformed_token_rejected_without_verification(
+        self, token: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Tokens not shaped like a JWT should be rejected before jwt.decode."""
 
-    @pytest.fixture
-    def client(self, app: FastAPI) -> TestClient:
-        """Create test client."""
-        return TestClient(app)
+        def fail_decode(*args: object, **kwargs: object) -> None:
+            raise AssertionError("jwt.decode should not be called for a malformed token")
 
-    def test_login_endpoint_exists(self, client: TestClient) -> None:
+        monkeypatch.setattr(auth_module.jwt, "decode", fail_decode)
+        with pytest.raises(UnauthorizedError):
+            decode_access_token(token)
+
+
+class TestAuthAPI:
+    """Test Auth API endpoints (SPEC Section 5)."""
+
+    async def test_login_endpoint_exists(self, auth_client: AsyncClient) -> None:
         """GET /api/v1/auth/login should exist."""
-        response = client.get("/api/v1/auth/login", follow_redirects=False)
+        response = await auth_client.get("/api/v1/auth/login", follow_redirects=False)
         # Should redirect or return login info (not 404)
         assert response.status_code != status.HTTP_404_NOT_FOUND
 
-    def test_callback_endpoint_exists(self, client: TestClient) -> None:
+    async def test_callback_endpoint_exists(self, auth_client: AsyncClient) -> None:
         """GET /api/v1/auth/callback should exist."""
-        response = client.get("/api/v1/auth/callback")
+        response = await auth_client.get("/api/v1/auth/callback")
         # Should return error without proper params, but not 404
         assert response.status_code != status.HTTP_404_NOT_FOUND
 
-    def test_logout_endpoint_exists(self, client: TestClient) -> None:
+    async def test_logout_endpoint_exists(self, auth_client: AsyncClient) -> None:
         """POST /api/v1/auth/logout should exist."""
-        response = client.post("/api/v1/auth/logout")
+        response = await auth_client.post("/api/v1/auth/logout")
         # Should require auth, but not 404
         assert response.status_code != status.HTTP_404_NOT_FOUND
 
-    def test_me_endpoint_requires_auth(self, client: TestClient) -> None:
+    async def test_me_endpoint_requires_auth(self, auth_client: AsyncClient) -> None:
         """GET /api/v1/auth/me should require authentication."""
-        response = client.get("/api/v1/auth/me")
+        response = await auth_client.get("/api/v1/auth/me")
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
-    def test_me_endpoint_returns_user_info(self, client: TestClient) -> None:
+    async def test_me_endpoint_returns_user_info(
+        self, auth_client: AsyncClient, valid_token: tuple[str, str]
+    ) -> None:
         """GET /api/v1/auth/me should return user info with valid token."""
-        # Create a mock user token
-        user_id = uuid4()
-        token = create_access_token(subject=str(user_id))
-        response = client.get(
+        _, token = valid_token
+        response = await auth_client.get(
             "/api/v1/auth/me",
             headers={"Authorization": f"Bearer {token}"},
         )
         # With mock auth, this should succeed or return user data
         assert response.status_code in [status.HTTP_200_OK, status.HTTP_404_NOT_FOUND]
 
+    async def test_me_endpoint_non_ascii_subject_bytes(self, auth_client: AsyncClient) -> None:
+        """Non-ASCII mock user fields should be served as raw UTF-8, like ORJSONResponse."""
+        token = create_access_token(subject="ユーザー-1")
+        response = await auth_client.get(
+            "/api/v1/auth/me",
+            headers={"Authorization": f"Bearer {token}"},
+        )
 
-class TestMockAuthFlow:
-    """Test Mock authentication flow for development environment."""
-
-    @pytest.fixture
-    def app(self) -> FastAPI:
-        """Create test FastAPI app with auth routes."""
-        from app.api.auth import router as auth_router
-        from app.core.error_handlers import register_exception_handlers
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == (
+            '{"id":"ユーザー-1","email":"user-ユーザー-1@example.com",'
+            '"name":"Mock User ユーザー-1","role":"user","department":"Engineering",'
+            '"balance":1000.0}'
+        ).encode()
 
-        app = FastAPI()
-        register_exception_handlers(app)
-        app.include_router(auth_router, prefix="/api/v1/auth")
-        return app
 
-    @pytest.fixture
-    def client(self, app: FastAPI) -> TestClient:
-        """Create test client."""
-        return TestClient(app)
+class TestMockAuthFlow:
+    """Test Mock authentication flow for development environment."""
 
-    def test_mock_login_returns_redirect_or_token(self, client: TestClient) -> None:
+    async def test_mock_login_returns_redirect_or_token(self, auth_client: AsyncClient) -> None:
         """Mock login should return redirect URL or direct token."""
-        response = client.get("/api/v1/auth/login", follow_redirects=False)
+        response = await auth_client.get("/api/v1/auth/login", follow_redirects=False)
         # In mock mode, should either redirect to callback or return token info
-        assert response.status_code in [
-            status.HTTP_200_OK,
-            status.HTTP_302_FOUND,
-            status.HTTP_307_TEMPORARY_REDIRECT,
-        ]
+        assert response.status_code in _LOGIN_OK_CODES
 
-    def test_mock_callback_with_mock_code_returns_token(self, client: TestClient) -> None:
+    async def test_mock_callback_with_mock_code_returns_token(
+        self, auth_client: AsyncClient
+    ) -> None:
         """Mock callback should return access token with mock code."""
-        response = client.get("/api/v1/auth/callback?code=mock_code")
+        response = await auth_client.get("/api/v1/auth/callback?code=mock_code")
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert "access_token" in data
         assert data["token_type"] == "bearer"
 
-    def test_logout_clears_session(self, client: TestClient) -> None:
+    async def test_mock_callback_hands_out_distinct_mock_users(
+        self, auth_client: AsyncClient
+    ) -> None:
+        """Consecutive mock callbacks should return tokens for different mock users."""
+        url = "/api/v1/auth/callback?code=mock_code"
+        first = (await auth_client.get(url)).json()["access_token"]
+        second = (await auth_client.get(url)).json()["access_token"]
+        assert decode_access_token(first)["sub"] != decode_access_token(second)["sub"]
+
+    def test_stale_pool_entry_is_resigned_alone(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A stale pool entry should be re-signed on its own, not the whole pool."""
+        pool = list(auth_api._mock_pool)
+        user_id, _, _ = pool[0]
+        pool[0] = (user_id, "stale-token", 0.0)
+        monkeypatch.setattr(auth_api, "_mock_pool", pool)
+        monkeypatch.setattr(auth_api, "_mock_pool_index", itertools.count())
+
+        signed: list[str] = []
+
+        def counting_create_access_token(subject: str) -> str:
+            signed.append(subject)
+            return create_access_token(subject=subject)
+
+        monkeypatch.setattr(auth_api, "create_access_token", counting_create_access_token)
+
+        token = auth_api._next_mock_token()
+
+        assert signed == [user_id]
+        assert decode_access_token(token)["sub"] == user_id
+        assert pool[0][1] == token
+        assert pool[0][2] > time.time()
+        # Fresh entries are handed out as-is
+        assert auth_api._next_mock_token() == pool[1][1]
+        assert signed == [user_id]
+
+    async def test_logout_clears_session(self, auth_client: AsyncClient) -> None:
         """Logout should return success."""
         # First get a token
-        response = client.get("/api/v1/auth/callback?code=mock_code")
+        response = await auth_client.get("/api/v1/auth/callback?code=mock_code")
         token = response.json()["access_token"]
 
         # Then logout
-        response = client.post(
+        response = await auth_client.post(
             "/api/v1/auth/logout",
             headers={"Authorization": f"Bearer {token}"},
         )
@@ -168,61 +329,25 @@ class TestMockAuthFlow:
 class TestGetCurrentUserDependency:
     """Test get_current_user FastAPI dependency."""
 
-    @pytest.fixture
-    def app(self) -> FastAPI:
-        """Create test FastAPI app with protected endpoint."""
-        from typing import Annotated
-
-        from fastapi import Depends
-
-        from app.api.auth import router as auth_router
-        from app.core.auth import get_current_user_id
-        from app.core.error_handlers import register_exception_handlers
-
-        app = FastAPI()
-        register_exception_handlers(app)
-        app.include_router(auth_router, prefix="/api/v1/auth")
-
-        @app.get("/protected")
-        async def protected_endpoint(
-            current_user_id: Annotated[str, Depends(get_current_user_id)],
-        ) -> dict:
-            return {"user_id": current_user_id}
-
-        return app
-
-    @pytest.fixture
-    def client(self, app: FastAPI) -> TestClient:
-        """Create test client."""
-        return TestClient(app)
-
-    def test_missing_auth_header_returns_error(self, client: TestClient) -> None:
+    async def test_missing_auth_header_returns_error(self, auth_client: AsyncClient) -> None:
         """Request without auth header should return error."""
-        response = client.get("/protected")
+        response = await auth_client.get("/protected")
         # HTTPBearer with auto_error=False returns None, our code raises UnauthorizedError
         # Note: FastAPI may return 422 in some configurations
-        assert response.status_code in [
-            status.HTTP_401_UNAUTHORIZED,
-            status.HTTP_403_FORBIDDEN,
-            422,  # FastAPI validation error in some cases
-        ]
+        assert response.status_code in _AUTH_FAIL_CODES
 
-    def test_invalid_auth_header_format_returns_error(self, client: TestClient) -> None:
+    async def test_invalid_auth_header_format_returns_error(self, auth_client: AsyncClient) -> None:
         """Request with invalid auth header format should return error."""
-        response = client.get(
+        response = await auth_client.get(
             "/protected",
             headers={"Authorization": "InvalidToken"},
         )
         # Invalid format returns error from FastAPI's HTTPBearer
-        assert response.status_code in [
-            status.HTTP_401_UNAUTHORIZED,
-            status.HTTP_403_FORBIDDEN,
-            422,  # FastAPI validation error
-        ]
+        assert response.status_code in _AUTH_FAIL_CODES
 
-    def test_invalid_bearer_token_returns_401(self, client: TestClient) -> None:
+    async def test_invalid_bearer_token_returns_401(self, auth_client: AsyncClient) -> None:
         """Request with invalid Bearer token should return 401."""
-        response = client.get(
+        response = await auth_client.get(
             "/protected",
             headers={"Authorization": "Bearer invalid.token.here"},
         )
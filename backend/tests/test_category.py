@@ -5,79 +5,75 @@ SPEC Section 4 & 5 compliant.
 from __future__ import annotations
 
 import uuid
+from collections.abc import AsyncIterator, Iterator
 
 import pytest
 from fastapi import FastAPI
-from fastapi.testclient import TestClient
-from sqlalchemy import select
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api import categories as categories_module
+from app.api.categories import MAX_BULK_CREATE
+from app.api.categories import router as categories_router
+from app.core.error_handlers import register_exception_handlers
+from app.core.rbac import get_current_user_data
+from app.db.session import get_db
+from app.models.category import Category
+from app.schemas.category import CategoryCreate, CategoryResponse
+from app.scripts.seed_categories import INITIAL_CATEGORIES, seed_categories
+
+# Request users for the API tests; built once since tests only read them
+_MOCK_USER_DATA = {
+    "id": str(uuid.uuid4()),
+    "email": "user@example.com",
+    "name": "Test User",
+    "role": "user",
+    "department": "Engineering",
+    "balance": 1000.00,
+}
+_MOCK_ADMIN_DATA = {
+    "id": str(uuid.uuid4()),
+    "email": "admin@example.com",
+    "name": "Admin User",
+    "role": "admin",
+    "department": "Engineering",
+    "balance": 1000.00,
+}
+
 
 class TestCategoryModel:
     """Unit tests for Category model (SPEC Section 4)."""
 
     def test_category_has_uuid_id_column(self) -> None:
         """Test that Category has UUID id column."""
-        from app.models.category import Category
-
         assert hasattr(Category, "id")
 
     def test_category_has_name_field(self) -> None:
         """Test that Category has name field (VARCHAR 50)."""
-        from app.models.category import Category
-
         assert hasattr(Category, "name")
 
     def test_category_has_description_field(self) -> None:
         """Test that Category has description field (TEXT)."""
-        from app.models.category import Category
-
         assert hasattr(Category, "description")
 
     def test_category_has_sort_order_field(self) -> None:
         """Test that Category has sort_order field (INT)."""
-        from app.models.category import Category
-
         assert hasattr(Category, "sort_order")
 
     def test_category_table_name(self) -> None:
         """Test that Category table name is 'categories'."""
-        from app.models.category import Category
-
         assert Category.__tablename__ == "categories"
 
 
 class TestCategoryModelDatabase:
     """Database integration tests for Category model."""
 
-    @pytest.fixture
-    async def db_session(self):
-        """Create a test database session."""
-        from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-        from sqlalchemy.orm import sessionmaker
-
-        from app.db.base import Base
-
-        engine = create_async_engine(
-            "sqlite+aiosqlite:///:memory:",
-            echo=False,
-        )
-
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-
-        async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-
-        async with async_session() as session:
-            yield session
-
-        await engine.dispose()
-
     @pytest.mark.asyncio
     async def test_create_category(self, db_session: AsyncSession) -> None:
         """Test creating a category."""
-        from app.models.category import Category
-
         category = Category(
             name="Product",
             description="Product related predictions",
@@ -96,8 +92,6 @@ class TestCategoryModelDatabase:
     @pytest.mark.asyncio
     async def test_category_defaults(self, db_session: AsyncSession) -> None:
         """Test category default values."""
-        from app.models.category import Category
-
         category = Category(name="Test")
         db_session.add(category)
         await db_session.commit()
@@ -109,13 +103,9 @@ class TestCategoryModelDatabase:
     @pytest.mark.asyncio
     async def test_category_name_unique(self, db_session: AsyncSession) -> None:
         """Test that category name is unique."""
-        from sqlalchemy.exc import IntegrityError
-
-        from app.models.category import Category
-
         category1 = Category(name="Unique", sort_order=1)
         db_session.add(category1)
-        await db_session.commit()
+        await db_session.flush()
 
         category2 = Category(name="Unique", sort_order=2)
         db_session.add(category2)
@@ -128,15 +118,13 @@ class TestCategoryModelDatabase:
         self, db_session: AsyncSession
     ) -> None:
         """Test that categories are ordered by sort_order."""
-        from app.models.category import Category
-
         # Create categories in random order
         cat_c = Category(name="Category C", sort_order=3)
         cat_a = Category(name="Category A", sort_order=1)
         cat_b = Category(name="Category B", sort_order=2)
 
         db_session.add_all([cat_c, cat_a, cat_b])
-        await db_session.commit()
+        await db_session.flush()
 
         # Query ordered by sort_order
         result = await db_session.execute(
@@ -150,68 +138,60 @@ class TestCategoryModelDatabase:
         assert categories[2].name == "Category C"
 
 
+    @pytest.mark.asyncio
+    async def test_seed_categories_is_idempotent(self, db_session: AsyncSession) -> None:
+        """Seeding twice should create each initial category once, in order."""
+        db_session.add(Category(name="Sales", sort_order=2))
+        await db_session.flush()
+
+        first = await seed_categories(db_session)
+        second = await seed_categories(db_session)
+
+        expected = [c["name"] for c in INITIAL_CATEGORIES]
+        assert [c.name for c in first] == expected
+        assert [c.id for c in second] == [c.id for c in first]
+        count = await db_session.scalar(select(func.count()).select_from(Category))
+        assert count == len(INITIAL_CATEGORIES)
+
+
 class TestCategoryAPI:
     """Integration tests for Category API endpoints."""
 
     @pytest.fixture
     def mock_user_data(self) -> dict:
-        """Create mock user data."""
-        return {
-            "id": str(uuid.uuid4()),
-            "email": "user@example.com",
-            "name": "Test User",
-            "role": "user",
-            "department": "Engineering",
-            "balance": 1000.00,
-        }
+        """Mock user data (shared, read-only)."""
+        return _MOCK_USER_DATA
 
     @pytest.fixture
     def mock_admin_data(self) -> dict:
-        """Create mock admin data."""
-        return {
-            "id": str(uuid.uuid4()),
-            "email": "admin@example.com",
-            "name": "Admin User",
-            "role": "admin",
-            "department": "Engineering",
-            "balance": 1000.00,
-        }
-
-    @pytest.fixture
-    async def db_session(self):
-        """Create a test database session."""
-        from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-        from sqlalchemy.orm import sessionmaker
-
-        from app.db.base import Base
-
-        engine = create_async_engine(
-            "sqlite+aiosqlite:///:memory:",
-            echo=False,
-        )
-
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-
-        async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-
-        async with async_session() as session:
-            yield session
-
-        await engine.dispose()
-
-    def _create_test_app(self, db_session: AsyncSession, user_data: dict) -> FastAPI:
-        """Create a test FastAPI app with mocked dependencies."""
-        from app.api.categories import router as categories_router
-        from app.core.error_handlers import register_exception_handlers
-        from app.core.rbac import get_current_user_data
-        from app.db.session import get_db
+        """Mock admin data (shared, read-only)."""
+        return _MOCK_ADMIN_DATA
 
+    @pytest.fixture(scope="class")
+    def app(self) -> FastAPI:
+        """Create the test FastAPI app once; tests only swap dependency overrides."""
         app = FastAPI()
         register_exception_handlers(app)
         app.include_router(categories_router, prefix="/api/v1")
+        return app
 
-        # Override dependencies
+    @pytest.fixture(scope="class")
+    async def client(self, app: FastAPI) -> AsyncIterator[AsyncClient]:
+        """Create an async client that calls the app on the test event loop."""
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+
+    @pytest.fixture(autouse=True)
+    def _clear_dependency_overrides(self, app: FastAPI) -> Iterator[None]:
+        """Drop the per-test dependency overrides from the shared app."""
+        yield
+        app.dependency_overrides.clear()
+
+    def _override_dependencies(
+        self, app: FastAPI, db_session: AsyncSession, user_data: dict
+    ) -> None:
+        """Point the shared app's database and user dependencies at this test."""
         async def mock_get_db():
             yield db_session
 
@@ -221,38 +201,30 @@ class TestCategoryAPI:
         app.dependency_overrides[get_db] = mock_get_db
         app.dependency_overrides[get_current_user_data] = mock_get_user
 
-        return app
-
     @pytest.mark.asyncio
     async def test_list_categories_empty(
-        self, db_session: AsyncSession, mock_user_data: dict
+        self, app: FastAPI, client: AsyncClient, db_session: AsyncSession, mock_user_data: dict
     ) -> None:
         """Test listing categories when none exist."""
-        app = self._create_test_app(db_session, mock_user_data)
-        client = TestClient(app)
-
-        response = client.get("/api/v1/categories")
+        self._override_dependencies(app, db_session, mock_user_data)
+        response = await client.get("/api/v1/categories")
 
         assert response.status_code == 200
         assert response.json() == []
 
     @pytest.mark.asyncio
     async def test_list_categories_with_data(
-        self, db_session: AsyncSession, mock_user_data: dict
+        self, app: FastAPI, client: AsyncClient, db_session: AsyncSession, mock_user_data: dict
     ) -> None:
         """Test listing categories with data."""
-        from app.models.category import Category
-
         # Create test categories
         cat1 = Category(name="Product", description="Product predictions", sort_order=1)
         cat2 = Category(name="Sales", description="Sales predictions", sort_order=2)
         db_session.add_all([cat1, cat2])
-        await db_session.commit()
-
-        app = self._create_test_app(db_session, mock_user_data)
-        client = TestClient(app)
+        await db_session.flush()
 
-        response = client.get("/api/v1/categories")
+        self._override_dependencies(app, db_session, mock_user_data)
+        response = await client.get("/api/v1/categories")
 
         assert response.status_code == 200
         data = response.json()
@@ -260,15 +232,36 @@ class TestCategoryAPI:
         assert data[0]["name"] == "Product"
         assert data[1]["name"] == "Sales"
 
+    @pytest.mark.asyncio
+    async def test_list_categories_streams_across_batches(
+        self,
+        app: FastAPI,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        mock_user_data: dict,
+        monkeypatch,
+    ) -> None:
+        """Test that the streamed array stays valid JSON across fetch batches."""
+        monkeypatch.setattr(categories_module, "_STREAM_BATCH_SIZE", 2)
+        db_session.add_all(
+            [Category(name=f"Category {i}", sort_order=i) for i in range(5)]
+        )
+        await db_session.flush()
+
+        self._override_dependencies(app, db_session, mock_user_data)
+        response = await client.get("/api/v1/categories")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert [c["name"] for c in response.json()] == [f"Category {i}" for i in range(5)]
+
     @pytest.mark.asyncio
     async def test_create_category_as_admin(
-        self, db_session: AsyncSession, mock_admin_data: dict
+        self, app: FastAPI, client: AsyncClient, db_session: AsyncSession, mock_admin_data: dict
     ) -> None:
         """Test creating a category as admin."""
-        app = self._create_test_app(db_session, mock_admin_data)
-        client = TestClient(app)
-
-        response = client.post(
+        self._override_dependencies(app, db_session, mock_admin_data)
+        response = await client.post(
             "/api/v1/categories",
             json={
                 "name": "New Category",
@@ -286,13 +279,11 @@ class TestCategoryAPI:
 
     @pytest.mark.asyncio
     async def test_create_category_as_user_forbidden(
-        self, db_session: AsyncSession, mock_user_data: dict
+        self, app: FastAPI, client: AsyncClient, db_session: AsyncSession, mock_user_data: dict
     ) -> None:
         """Test that regular users cannot create categories."""
-        app = self._create_test_app(db_session, mock_user_data)
-        client = TestClient(app)
-
-        response = client.post(
+        self._override_dependencies(app, db_session, mock_user_data)
+        response = await client.post(
             "/api/v1/categories",
             json={
                 "name": "New Category",
@@ -305,20 +296,16 @@ class TestCategoryAPI:
 
     @pytest.mark.asyncio
     async def test_create_category_duplicate_name(
-        self, db_session: AsyncSession, mock_admin_data: dict
+        self, app: FastAPI, client: AsyncClient, db_session: AsyncSession, mock_admin_data: dict
     ) -> None:
         """Test creating a category with duplicate name."""
-        from app.models.category import Category
-
         # Create existing category
         existing = Category(name="Existing", sort_order=1)
         db_session.add(existing)
-        await db_session.commit()
-
-        app = self._create_test_app(db_session, mock_admin_data)
-        client = TestClient(app)
+        await db_session.flush()
 
-        response = client.post(
+        self._override_dependencies(app, db_session, mock_admin_data)
+        response = await client.post(
             "/api/v1/categories",
             json={"name": "Existing", "sort_order": 2},
         )
@@ -328,13 +315,11 @@ class TestCategoryAPI:
 
     @pytest.mark.asyncio
     async def test_create_category_default_sort_order(
-        self, db_session: AsyncSession, mock_admin_data: dict
+        self, app: FastAPI, client: AsyncClient, db_session: AsyncSession, mock_admin_data: dict
     ) -> None:
         """Test creating a category with default sort_order."""
-        app = self._create_test_app(db_session, mock_admin_data)
-        client = TestClient(app)
-
-        response = client.post(
+        self._override_dependencies(app, db_session, mock_admin_data)
+        response = await client.post(
             "/api/v1/categories",
             json={"name": "Minimal Category"},
         )
@@ -343,14 +328,113 @@ class TestCategoryAPI:
         data = response.json()
         assert data["sort_order"] == 0  # Default
 
+    @pytest.mark.asyncio
+    async def test_bulk_create_categories_as_admin(
+        self, app: FastAPI, client: AsyncClient, db_session: AsyncSession, mock_admin_data: dict
+    ) -> None:
+        """Test creating several categories in one request."""
+        self._override_dependencies(app, db_session, mock_admin_data)
+        response = await client.post(
+            "/api/v1/categories/bulk",
+            json=[
+                {"name": "Bulk A", "sort_order": 1},
+                {"name": "Bulk B", "description": "Second", "sort_order": 2},
+            ],
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert [c["name"] for c in data] == ["Bulk A", "Bulk B"]
+        assert data[1]["description"] == "Second"
+        assert all("id" in c for c in data)
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_duplicate_name_rejected(
+        self, app: FastAPI, client: AsyncClient, db_session: AsyncSession, mock_admin_data: dict
+    ) -> None:
+        """Test that a duplicate name fails the whole bulk request."""
+        db_session.add(Category(name="Existing", sort_order=1))
+        # Committed: the endpoint's rollback must not discard the existing row
+        await db_session.commit()
+
+        self._override_dependencies(app, db_session, mock_admin_data)
+        response = await client.post(
+            "/api/v1/categories/bulk",
+            json=[{"name": "Fresh"}, {"name": "Existing"}],
+        )
+
+        assert response.status_code == 422
+        assert "already exist" in response.json()["message"].lower()
+        count = await db_session.scalar(select(func.count()).select_from(Category))
+        assert count == 1
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_ignore_conflicts(
+        self, app: FastAPI, client: AsyncClient, db_session: AsyncSession, mock_admin_data: dict
+    ) -> None:
+        """Test that ignore_conflicts skips existing names."""
+        db_session.add(Category(name="Existing", sort_order=1))
+        await db_session.flush()
+
+        self._override_dependencies(app, db_session, mock_admin_data)
+        response = await client.post(
+            "/api/v1/categories/bulk?ignore_conflicts=true",
+            json=[{"name": "Fresh"}, {"name": "Existing"}],
+        )
+
+        assert response.status_code == 201
+        assert [c["name"] for c in response.json()] == ["Fresh"]
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_ignore_conflicts_keeps_request_order(
+        self, app: FastAPI, client: AsyncClient, db_session: AsyncSession, mock_admin_data: dict
+    ) -> None:
+        """Test that rows around a skipped conflict come back in request order."""
+        db_session.add(Category(name="Existing", sort_order=1))
+        await db_session.flush()
+
+        self._override_dependencies(app, db_session, mock_admin_data)
+        response = await client.post(
+            "/api/v1/categories/bulk?ignore_conflicts=true",
+            json=[{"name": "Zeta"}, {"name": "Existing"}, {"name": "Alpha"}],
+        )
+
+        assert response.status_code == 201
+        assert [c["name"] for c in response.json()] == ["Zeta", "Alpha"]
+
+    @pytest.mark.parametrize("dialect_name", ["postgresql", "sqlite"])
+    def test_bulk_ignore_conflicts_stmt_is_not_sentinel_sorted(self, dialect_name: str) -> None:
+        """ON CONFLICT DO NOTHING may skip rows, so RETURNING must not be parameter-sorted."""
+        stmt = categories_module._bulk_insert_stmt(dialect_name, ignore_conflicts=True)
+        dialect = postgresql.dialect() if dialect_name == "postgresql" else sqlite.dialect()
+
+        assert "ON CONFLICT (name) DO NOTHING" in str(stmt.compile(dialect=dialect))
+        assert stmt._sort_by_parameter_order is False
+
+    def test_bulk_stmt_without_conflicts_is_parameter_sorted(self) -> None:
+        """Plain bulk inserts return every row, so they keep request order in SQL."""
+        stmt = categories_module._bulk_insert_stmt("postgresql", ignore_conflicts=False)
+        assert stmt._sort_by_parameter_order is True
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_rejects_oversized_payload(
+        self, app: FastAPI, client: AsyncClient, db_session: AsyncSession, mock_admin_data: dict
+    ) -> None:
+        """Test that bulk requests above the size limit are rejected."""
+        self._override_dependencies(app, db_session, mock_admin_data)
+        response = await client.post(
+            "/api/v1/categories/bulk",
+            json=[{"name": f"Category {i}"} for i in range(MAX_BULK_CREATE + 1)],
+        )
+
+        assert response.status_code == 422
+
 
 class TestCategorySchemas:
     """Tests for Category Pydantic schemas."""
 
     def test_category_response_schema(self) -> None:
         """Test CategoryResponse schema."""
-        from app.schemas.category import CategoryResponse
-
         data = CategoryResponse(
             id=uuid.uuid4(),
             name="Test",
@@ -361,8 +445,6 @@ class TestCategorySchemas:
 
     def test_category_create_schema_minimal(self) -> None:
         """Test CategoryCreate schema with minimal data."""
-        from app.schemas.category import CategoryCreate
-
         data = CategoryCreate(name="Test")
         assert data.name == "Test"
         assert data.description is None
@@ -370,8 +452,6 @@ class TestCategorySchemas:
 
     def test_category_create_schema_full(self) -> None:
         """Test CategoryCreate schema with all fields."""
-        from app.schemas.category import CategoryCreate
-
         data = CategoryCreate(
             name="Full",
             description="Full description",
@@ -3,11 +3,19 @@ Tests for custom exceptions and error handlers - SPEC Section 8 compliance.
 """
 from __future__ import annotations
 
+import asyncio
+import pickle
+from collections.abc import Iterator
+
+import orjson
 import pytest
 from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
+from starlette.types import Message, Receive, Scope, Send
 
-from app.core.error_handlers import register_exception_handlers
+from app.core.error_handlers import AppErrorMiddleware, register_exception_handlers
 from app.core.exceptions import (
     AppError,
     ErrorCode,
@@ -24,8 +32,42 @@ from app.core.exceptions import (
     ValidationError,
 )
 
-
-@pytest.fixture
+# (exception class, expected error code, expected HTTP status) per SPEC section
+_TRADING_ERRORS = [
+    (InsufficientBalanceError, ErrorCode.INSUFFICIENT_BALANCE, 400),
+    (InsufficientPositionError, ErrorCode.INSUFFICIENT_POSITION, 400),
+    (MarketNotOpenError, ErrorCode.MARKET_NOT_OPEN, 400),
+    (InvalidQuantityError, ErrorCode.INVALID_QUANTITY, 400),
+    (PriceBoundaryExceededError, ErrorCode.PRICE_BOUNDARY_EXCEEDED, 400),
+]
+_AUTH_ERRORS = [
+    (UnauthorizedError, ErrorCode.UNAUTHORIZED, 401),
+    (ForbiddenError, ErrorCode.FORBIDDEN, 403),
+    (TokenExpiredError, ErrorCode.TOKEN_EXPIRED, 401),
+]
+_GENERAL_ERRORS = [
+    (NotFoundError, ErrorCode.NOT_FOUND, 404),
+    (ValidationError, ErrorCode.VALIDATION_ERROR, 422),
+    (InternalError, ErrorCode.INTERNAL_ERROR, 500),
+]
+
+# (url, expected status, expected error_code, expected details), one per status class
+_ERROR_ENDPOINTS = [
+    ("/raise-insufficient-balance", 400, "INSUFFICIENT_BALANCE", None),
+    ("/raise-unauthorized", 401, "UNAUTHORIZED", None),
+    ("/raise-forbidden", 403, "FORBIDDEN", None),
+    ("/raise-not-found", 404, "NOT_FOUND", None),
+    (
+        "/raise-validation-error",
+        422,
+        "VALIDATION_ERROR",
+        {"field": "email", "message": "invalid format"},
+    ),
+    ("/raise-internal-error", 500, "INTERNAL_ERROR", None),
+]
+
+
+@pytest.fixture(scope="module")
 def test_app() -> FastAPI:
     """Create a test FastAPI app with error handlers registered."""
     app = FastAPI()
@@ -35,22 +77,6 @@ def test_app() -> FastAPI:
     async def raise_insufficient_balance():
         raise InsufficientBalanceError()
 
-    @app.get("/raise-insufficient-position")
-    async def raise_insufficient_position():
-        raise InsufficientPositionError()
-
-    @app.get("/raise-market-not-open")
-    async def raise_market_not_open():
-        raise MarketNotOpenError()
-
-    @app.get("/raise-invalid-quantity")
-    async def raise_invalid_quantity():
-        raise InvalidQuantityError()
-
-    @app.get("/raise-price-boundary")
-    async def raise_price_boundary():
-        raise PriceBoundaryExceededError()
-
     @app.get("/raise-unauthorized")
     async def raise_unauthorized():
         raise UnauthorizedError()
@@ -59,10 +85,6 @@ def test_app() -> FastAPI:
     async def raise_forbidden():
         raise ForbiddenError()
 
-    @app.get("/raise-token-expired")
-    async def raise_token_expired():
-        raise TokenExpiredError()
-
     @app.get("/raise-not-found")
     async def raise_not_found():
         raise NotFoundError()
@@ -82,13 +104,22 @@ def test_app() -> FastAPI:
             details={"required": 150, "available": 50},
         )
 
+    @app.get("/raise-after-start")
+    async def raise_after_start():
+        async def body():
+            yield b"partial"
+            raise InsufficientBalanceError()
+
+        return StreamingResponse(body())
+
     return app
 
 
-@pytest.fixture
-def client(test_app: FastAPI) -> TestClient:
-    """Create a test client."""
-    return TestClient(test_app)
+@pytest.fixture(scope="module")
+def client(test_app: FastAPI) -> Iterator[TestClient]:
+    """Create a test client shared by the module (all routes are read-only)."""
+    with TestClient(test_app) as client:
+        yield client
 
 
 class TestErrorCode:
@@ -140,89 +171,131 @@ class TestAppError:
         )
         assert exc.details is None
 
+    def test_app_error_str_is_message(self) -> None:
+        """str(AppError) should be the message, including subclass defaults."""
+        exc = AppError(
+            error_code=ErrorCode.INTERNAL_ERROR,
+            message="Test error",
+            status_code=500,
+        )
+        assert str(exc) == "Test error"
+        assert str(UnauthorizedError()) == "Authentication required"
+
+    def test_app_error_args_hold_message(self) -> None:
+        """args and repr() should carry the message for logging."""
+        exc = NotFoundError(message="Market not found")
+        assert exc.args == ("Market not found",)
+        assert repr(exc) == "NotFoundError('Market not found')"
+
+    @pytest.mark.parametrize(
+        "exc",
+        [
+            NotFoundError(details={"id": "m-1"}),
+            AppError(error_code=ErrorCode.FORBIDDEN, message="No", status_code=403),
+        ],
+    )
+    def test_app_error_pickle_round_trip(self, exc: AppError) -> None:
+        """Errors should survive pickling across process boundaries."""
+        restored = pickle.loads(pickle.dumps(exc))
+        assert type(restored) is type(exc)
+        assert restored.args == exc.args
+        assert (restored.error_code, restored.message, restored.status_code, restored.details) == (
+            exc.error_code,
+            exc.message,
+            exc.status_code,
+            exc.details,
+        )
+
 
 class TestTradingExceptions:
     """Test trading exception classes (SPEC Section 8.1)."""
 
-    def test_insufficient_balance_error(self) -> None:
-        """InsufficientBalanceError should have correct defaults."""
+    @pytest.mark.parametrize(("exc_type", "error_code", "status_code"), _TRADING_ERRORS)
+    def test_trading_exception_defaults(
+        self, exc_type: type[AppError], error_code: ErrorCode, status_code: int
+    ) -> None:
+        """Trading exceptions should have the correct error_code and status."""
+        exc = exc_type()
+        assert exc.error_code is error_code
+        assert exc.status_code == status_code
+
+    def test_insufficient_balance_error_message(self) -> None:
+        """InsufficientBalanceError's default message should mention the balance."""
         exc = InsufficientBalanceError()
-        assert exc.error_code == ErrorCode.INSUFFICIENT_BALANCE
-        assert exc.status_code == 400
         assert "balance" in exc.message.lower() or "残高" in exc.message
 
-    def test_insufficient_position_error(self) -> None:
-        """InsufficientPositionError should have correct defaults."""
-        exc = InsufficientPositionError()
-        assert exc.error_code == ErrorCode.INSUFFICIENT_POSITION
-        assert exc.status_code == 400
 
-    def test_market_not_open_error(self) -> None:
-        """MarketNotOpenError should have correct defaults."""
-        exc = MarketNotOpenError()
-        assert exc.error_code == ErrorCode.MARKET_NOT_OPEN
-        assert exc.status_code == 400
+class TestAuthExceptions:
+    """Test authentication/authorization exception classes (SPEC Section 8.2)."""
 
-    def test_invalid_quantity_error(self) -> None:
-        """InvalidQuantityError should have correct defaults."""
-        exc = InvalidQuantityError()
-        assert exc.error_code == ErrorCode.INVALID_QUANTITY
-        assert exc.status_code == 400
+    @pytest.mark.parametrize(("exc_type", "error_code", "status_code"), _AUTH_ERRORS)
+    def test_auth_exception_defaults(
+        self, exc_type: type[AppError], error_code: ErrorCode, status_code: int
+    ) -> None:
+        """Auth exceptions should have the correct error_code and status."""
+        exc = exc_type()
+        assert exc.error_code is error_code
+        assert exc.status_code == status_code
 
-    def test_price_boundary_exceeded_error(self) -> None:
-        """PriceBoundaryExceededError should have correct defaults."""
-        exc = PriceBoundaryExceededError()
-        assert exc.error_code == ErrorCode.PRICE_BOUNDARY_EXCEEDED
-        assert exc.status_code == 400
 
+class TestGeneralExceptions:
+    """Test general exception classes (SPEC Section 8.3)."""
 
-class TestAuthExceptions:
-    """Test authentication/authorization exception classes (SPEC Section 8.2)."""
+    @pytest.mark.parametrize(("exc_type", "error_code", "status_code"), _GENERAL_ERRORS)
+    def test_general_exception_defaults(
+        self, exc_type: type[AppError], error_code: ErrorCode, status_code: int
+    ) -> None:
+        """General exceptions should have the correct error_code and status."""
+        exc = exc_type()
+        assert exc.error_code is error_code
+        assert exc.status_code == status_code
 
-    def test_unauthorized_error(self) -> None:
-        """UnauthorizedError should return 401."""
-        exc = UnauthorizedError()
-        assert exc.error_code == ErrorCode.UNAUTHORIZED
-        assert exc.status_code == 401
 
-    def test_forbidden_error(self) -> None:
-        """ForbiddenError should return 403."""
-        exc = ForbiddenError()
-        assert exc.error_code == ErrorCode.FORBIDDEN
-        assert exc.status_code == 403
+class _MarketNotFoundError(NotFoundError):
+    """NotFoundError that only overrides the default message."""
 
-    def test_token_expired_error(self) -> None:
-        """TokenExpiredError should return 401."""
-        exc = TokenExpiredError()
-        assert exc.error_code == ErrorCode.TOKEN_EXPIRED
-        assert exc.status_code == 401
+    DEFAULT_MESSAGE = "Market not found"
 
+    __slots__ = ()
 
-class TestGeneralExceptions:
-    """Test general exception classes (SPEC Section 8.3)."""
 
-    def test_not_found_error(self) -> None:
-        """NotFoundError should return 404."""
-        exc = NotFoundError()
-        assert exc.error_code == ErrorCode.NOT_FOUND
-        assert exc.status_code == 404
-
-    def test_validation_error(self) -> None:
-        """ValidationError should return 422."""
-        exc = ValidationError()
-        assert exc.error_code == ErrorCode.VALIDATION_ERROR
-        assert exc.status_code == 422
-
-    def test_internal_error(self) -> None:
-        """InternalError should return 500."""
-        exc = InternalError()
-        assert exc.error_code == ErrorCode.INTERNAL_ERROR
-        assert exc.status_code == 500
+async def _call_middleware(exc: AppError) -> tuple[Message, bytes]:
+    """Run AppErrorMiddleware around an app that raises exc, without HTTP."""
+
+    async def raising_app(scope: Scope, receive: Receive, send: Send) -> None:
+        raise exc
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    messages: list[Message] = []
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    await AppErrorMiddleware(raising_app)({"type": "http"}, receive, send)
+    start, body = messages
+    return start, body["body"]
 
 
 class TestErrorHandlers:
     """Test FastAPI error handlers return correct response format."""
 
+    @pytest.mark.parametrize(
+        ("exc_type", "error_code", "status_code"),
+        _TRADING_ERRORS + _AUTH_ERRORS + _GENERAL_ERRORS,
+    )
+    async def test_middleware_renders_error(
+        self, exc_type: type[AppError], error_code: ErrorCode, status_code: int
+    ) -> None:
+        """The ASGI middleware should map each error to its status and error_code."""
+        start, body = await _call_middleware(exc_type())
+        assert start["status"] == status_code
+        data = orjson.loads(body)
+        assert data["error_code"] == error_code.value
+        assert data["message"] == exc_type.DEFAULT_MESSAGE
+        assert data["details"] is None
+
     def test_response_format_has_required_fields(self, client: TestClient) -> None:
         """Error response should have error_code, message, details fields."""
         response = client.get("/raise-insufficient-balance")
@@ -232,83 +305,21 @@ class TestErrorHandlers:
         assert "message" in data
         assert "details" in data
 
-    def test_insufficient_balance_response(self, client: TestClient) -> None:
-        """InsufficientBalanceError should return 400 with correct error_code."""
-        response = client.get("/raise-insufficient-balance")
-        assert response.status_code == 400
-        data = response.json()
-        assert data["error_code"] == "INSUFFICIENT_BALANCE"
-
-    def test_insufficient_position_response(self, client: TestClient) -> None:
-        """InsufficientPositionError should return 400 with correct error_code."""
-        response = client.get("/raise-insufficient-position")
-        assert response.status_code == 400
-        data = response.json()
-        assert data["error_code"] == "INSUFFICIENT_POSITION"
-
-    def test_market_not_open_response(self, client: TestClient) -> None:
-        """MarketNotOpenError should return 400 with correct error_code."""
-        response = client.get("/raise-market-not-open")
-        assert response.status_code == 400
-        data = response.json()
-        assert data["error_code"] == "MARKET_NOT_OPEN"
-
-    def test_invalid_quantity_response(self, client: TestClient) -> None:
-        """InvalidQuantityError should return 400 with correct error_code."""
-        response = client.get("/raise-invalid-quantity")
-        assert response.status_code == 400
-        data = response.json()
-        assert data["error_code"] == "INVALID_QUANTITY"
-
-    def test_price_boundary_response(self, client: TestClient) -> None:
-        """PriceBoundaryExceededError should return 400 with correct error_code."""
-        response = client.get("/raise-price-boundary")
-        assert response.status_code == 400
-        data = response.json()
-        assert data["error_code"] == "PRICE_BOUNDARY_EXCEEDED"
-
-    def test_unauthorized_response(self, client: TestClient) -> None:
-        """UnauthorizedError should return 401 with correct error_code."""
-        response = client.get("/raise-unauthorized")
-        assert response.status_code == 401
-        data = response.json()
-        assert data["error_code"] == "UNAUTHORIZED"
-
-    def test_forbidden_response(self, client: TestClient) -> None:
-        """ForbiddenError should return 403 with correct error_code."""
-        response = client.get("/raise-forbidden")
-        assert response.status_code == 403
-        data = response.json()
-        assert data["error_code"] == "FORBIDDEN"
-
-    def test_token_expired_response(self, client: TestClient) -> None:
-        """TokenExpiredError should return 401 with correct error_code."""
-        response = client.get("/raise-token-expired")
-        assert response.status_code == 401
-        data = response.json()
-        assert data["error_code"] == "TOKEN_EXPIRED"
-
-    def test_not_found_response(self, client: TestClient) -> None:
-        """NotFoundError should return 404 with correct error_code."""
-        response = client.get("/raise-not-found")
-        assert response.status_code == 404
-        data = response.json()
-        assert data["error_code"] == "NOT_FOUND"
-
-    def test_validation_error_response(self, client: TestClient) -> None:
-        """ValidationError should return 422 with correct error_code."""
-        response = client.get("/raise-validation-error")
-        assert response.status_code == 422
-        data = response.json()
-        assert data["error_code"] == "VALIDATION_ERROR"
-        assert data["details"] == {"field": "email", "message": "invalid format"}
-
-    def test_internal_error_response(self, client: TestClient) -> None:
-        """InternalError should return 500 with correct error_code."""
-        response = client.get("/raise-internal-error")
-        assert response.status_code == 500
-        data = response.json()
-        assert data["error_code"] == "INTERNAL_ERROR"
+    async def test_error_responses(self, test_app: FastAPI) -> None:
+        """Each status class should round-trip through HTTP with its error_code."""
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            responses = await asyncio.gather(
+                *(client.get(url) for url, _, _, _ in _ERROR_ENDPOINTS)
+            )
+
+        for (url, status_code, error_code, details), response in zip(
+            _ERROR_ENDPOINTS, responses, strict=True
+        ):
+            assert response.status_code == status_code, url
+            data = response.json()
+            assert data["error_code"] == error_code, url
+            assert data["details"] == details, url
 
     def test_custom_message_and_details(self, client: TestClient) -> None:
         """Custom message and details should be included in response."""
@@ -318,3 +329,67 @@ class TestErrorHandlers:
         assert data["error_code"] == "INSUFFICIENT_BALANCE"
         assert data["message"] == "You need 100 more points"
         assert data["details"] == {"required": 150, "available": 50}
+
+    def test_error_response_is_json(self, client: TestClient) -> None:
+        """Error responses should be served as application/json."""
+        response = client.get("/raise-custom-message")
+        assert response.headers["content-type"] == "application/json"
+        assert response.headers["content-length"] == str(len(response.content))
+
+    def test_error_after_response_start_is_reraised(self, client: TestClient) -> None:
+        """An AppError raised mid-stream cannot be rewritten and must propagate."""
+        with pytest.raises(InsufficientBalanceError):
+            client.get("/raise-after-start")
+
+    @pytest.mark.parametrize("exc_type", AppError.__subclasses__())
+    def test_code_str_matches_error_code(self, exc_type: type[AppError]) -> None:
+        """Precomputed CODE_STR should equal the instance's error_code value."""
+        exc = exc_type()
+        assert exc.CODE_STR == exc.error_code.value
+
+    @pytest.mark.parametrize("exc_type", AppError.__subclasses__())
+    def test_default_body_matches_rendered_body(self, exc_type: type[AppError]) -> None:
+        """The pre-serialized default body should equal a freshly rendered one."""
+        from app.core.error_handlers import render_error_body
+
+        exc = exc_type()
+        assert exc.has_default_body
+        assert exc.DEFAULT_BODY == render_error_body(exc)
+        assert exc.DEFAULT_CONTENT_LENGTH == str(len(exc.DEFAULT_BODY)).encode()
+
+    def test_custom_message_or_details_skip_default_body(self) -> None:
+        """Errors with a custom message or details must be serialized fresh."""
+        assert not InsufficientBalanceError("custom").has_default_body
+        assert not InsufficientBalanceError(details={"required": 1}).has_default_body
+        assert not AppError(ErrorCode.NOT_FOUND, "missing", 404).has_default_body
+
+    async def test_subclass_overriding_only_message_sends_its_message(self) -> None:
+        """A subclass that only sets DEFAULT_MESSAGE should get its own body."""
+        exc = _MarketNotFoundError()
+        assert exc.message == "Market not found"
+        assert exc.has_default_body
+
+        start, body = await _call_middleware(exc)
+        assert start["status"] == 404
+        assert orjson.loads(body) == {
+            "error_code": "NOT_FOUND",
+            "message": "Market not found",
+            "details": None,
+        }
+
+    def test_equal_default_message_uses_default_body(self) -> None:
+        """An equal message that is a different str object should still match."""
+        message = "".join(["Resource ", "not found"])
+        assert message is not NotFoundError.DEFAULT_MESSAGE
+        assert NotFoundError(message).has_default_body
+
+    def test_bare_app_error_body_uses_enum_value(self) -> None:
+        """AppError without CODE_STR should fall back to error_code.value."""
+        from app.core.error_handlers import render_error_body
+
+        exc = AppError(ErrorCode.NOT_FOUND, "missing", 404)
+        assert orjson.loads(render_error_body(exc)) == {
+            "error_code": "NOT_FOUND",
+            "message": "missing",
+            "details": None,
+        }
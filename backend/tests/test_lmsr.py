@@ -7,61 +7,99 @@ from __future__ import annotations
 import math
 from decimal import Decimal
 
+import numpy as np
 import pytest
 
+import app.core.lmsr as lmsr
+from app.core.lmsr import (
+    MAX_PRICE,
+    MIN_PRICE,
+    _as_f64,
+    _lmsr_cost_delta,
+    _lmsr_incremental,
+    _lmsr_kernel,
+    _lmsr_state,
+    _to_decimal,
+    calculate_prices,
+    calculate_prices_float,
+    calculate_trade_cost,
+    calculate_trade_cost_float,
+    cost_function,
+    estimate_shares_for_cost,
+    is_trade_allowed,
+)
+
+
+def _f(x: Decimal | float) -> float:
+    """Compare LMSR results as floats instead of with Decimal arithmetic."""
+    return float(x) if isinstance(x, Decimal) else x
+
+
+class TestLMSRPublicAPI:
+    """Tests that the LMSR module exposes its public API."""
+
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "cost_function",
+            "calculate_prices",
+            "calculate_trade_cost",
+            "is_trade_allowed",
+            "MIN_PRICE",
+            "MAX_PRICE",
+        ],
+    )
+    def test_public_api(self, name: str) -> None:
+        """Each public name should be defined on app.core.lmsr."""
+        assert hasattr(lmsr, name)
+
 
 class TestLMSRCostFunction:
     """Tests for LMSR cost function C(q) = b * ln(Σ e^(q_i/b))."""
 
-    def test_cost_function_exists(self) -> None:
-        """Test that cost function is importable."""
-        from app.core.lmsr import cost_function
-
-        assert callable(cost_function)
-
     def test_cost_function_binary_equal_quantities(self) -> None:
         """Test cost for binary market with equal quantities."""
-        from app.core.lmsr import cost_function
-
         # q = [0, 0], b = 100
         # C = 100 * ln(e^0 + e^0) = 100 * ln(2) ≈ 69.31
         quantities = [Decimal("0"), Decimal("0")]
         b = Decimal("100")
         result = cost_function(quantities, b)
 
-        expected = Decimal("100") * Decimal(str(math.log(2)))
-        assert abs(result - expected) < Decimal("0.01")
+        expected = 100 * math.log(2)
+        assert _f(result) == pytest.approx(expected, abs=0.01)
 
     def test_cost_function_binary_unequal_quantities(self) -> None:
         """Test cost for binary market with unequal quantities."""
-        from app.core.lmsr import cost_function
-
         # q = [10, 0], b = 100
         quantities = [Decimal("10"), Decimal("0")]
         b = Decimal("100")
         result = cost_function(quantities, b)
 
         # C = 100 * ln(e^(10/100) + e^0) = 100 * ln(e^0.1 + 1)
-        expected = Decimal("100") * Decimal(str(math.log(math.exp(0.1) + 1)))
-        assert abs(result - expected) < Decimal("0.01")
+        expected = 100 * math.log(math.exp(0.1) + 1)
+        assert _f(result) == pytest.approx(expected, abs=0.01)
 
     def test_cost_function_categorical_three_outcomes(self) -> None:
         """Test cost for categorical market with 3 outcomes."""
-        from app.core.lmsr import cost_function
-
         # q = [0, 0, 0], b = 100
         # C = 100 * ln(3) ≈ 109.86
         quantities = [Decimal("0"), Decimal("0"), Decimal("0")]
         b = Decimal("100")
         result = cost_function(quantities, b)
 
-        expected = Decimal("100") * Decimal(str(math.log(3)))
-        assert abs(result - expected) < Decimal("0.01")
+        expected = 100 * math.log(3)
+        assert _f(result) == pytest.approx(expected, abs=0.01)
+
+    @pytest.mark.parametrize("n_outcomes", [2, 5, 31, 32, 40])
+    def test_cost_function_zero_market_matches_kernel(self, n_outcomes: int) -> None:
+        """The all-zero shortcut should agree with the log-sum-exp kernel."""
+        quantities = [Decimal("0")] * n_outcomes
+        b = Decimal("250")
+        kernel_cost, _ = _lmsr_kernel(_as_f64(quantities), 250.0)
+        assert cost_function(quantities, b) == _to_decimal(kernel_cost)
 
     def test_cost_function_increases_with_quantity(self) -> None:
         """Test that cost increases when any quantity increases."""
-        from app.core.lmsr import cost_function
-
         b = Decimal("100")
         q1 = [Decimal("0"), Decimal("0")]
         q2 = [Decimal("10"), Decimal("0")]
@@ -75,39 +113,27 @@ class TestLMSRCostFunction:
 class TestLMSRPriceCalculation:
     """Tests for LMSR price (probability) calculation p_i = e^(q_i/b) / Σ e^(q_j/b)."""
 
-    def test_price_function_exists(self) -> None:
-        """Test that price function is importable."""
-        from app.core.lmsr import calculate_prices
-
-        assert callable(calculate_prices)
-
     def test_prices_sum_to_one(self) -> None:
         """Test that prices (probabilities) sum to 1.0."""
-        from app.core.lmsr import calculate_prices
-
         quantities = [Decimal("0"), Decimal("0")]
         b = Decimal("100")
         prices = calculate_prices(quantities, b)
 
         total = sum(prices)
-        assert abs(total - Decimal("1")) < Decimal("0.0001")
+        assert _f(total) == pytest.approx(1.0, abs=0.0001)
 
     def test_equal_quantities_give_equal_prices(self) -> None:
         """Test that equal quantities give equal prices."""
-        from app.core.lmsr import calculate_prices
-
         quantities = [Decimal("0"), Decimal("0")]
         b = Decimal("100")
         prices = calculate_prices(quantities, b)
 
         assert len(prices) == 2
-        assert abs(prices[0] - Decimal("0.5")) < Decimal("0.0001")
-        assert abs(prices[1] - Decimal("0.5")) < Decimal("0.0001")
+        assert _f(prices[0]) == pytest.approx(0.5, abs=0.0001)
+        assert _f(prices[1]) == pytest.approx(0.5, abs=0.0001)
 
     def test_higher_quantity_gives_higher_price(self) -> None:
         """Test that higher quantity gives higher price."""
-        from app.core.lmsr import calculate_prices
-
         quantities = [Decimal("50"), Decimal("0")]
         b = Decimal("100")
         prices = calculate_prices(quantities, b)
@@ -116,40 +142,28 @@ class TestLMSRPriceCalculation:
 
     def test_categorical_prices_sum_to_one(self) -> None:
         """Test that categorical market prices sum to 1.0."""
-        from app.core.lmsr import calculate_prices
-
         quantities = [Decimal("10"), Decimal("20"), Decimal("30")]
         b = Decimal("100")
         prices = calculate_prices(quantities, b)
 
         total = sum(prices)
-        assert abs(total - Decimal("1")) < Decimal("0.0001")
+        assert _f(total) == pytest.approx(1.0, abs=0.0001)
 
     def test_three_equal_quantities_give_third_each(self) -> None:
         """Test that 3 equal quantities give 1/3 probability each."""
-        from app.core.lmsr import calculate_prices
-
         quantities = [Decimal("0"), Decimal("0"), Decimal("0")]
         b = Decimal("100")
         prices = calculate_prices(quantities, b)
 
         for price in prices:
-            assert abs(price - Decimal("1") / Decimal("3")) < Decimal("0.0001")
+            assert _f(price) == pytest.approx(1 / 3, abs=0.0001)
 
 
 class TestLMSRTradeCost:
     """Tests for LMSR trade cost calculation: cost = C(q_new) - C(q_old)."""
 
-    def test_trade_cost_function_exists(self) -> None:
-        """Test that trade cost function is importable."""
-        from app.core.lmsr import calculate_trade_cost
-
-        assert callable(calculate_trade_cost)
-
     def test_buy_trade_cost_positive(self) -> None:
         """Test that buying shares has positive cost."""
-        from app.core.lmsr import calculate_trade_cost
-
         quantities = [Decimal("0"), Decimal("0")]
         b = Decimal("100")
         outcome_index = 0
@@ -161,8 +175,6 @@ class TestLMSRTradeCost:
 
     def test_sell_trade_cost_negative(self) -> None:
         """Test that selling shares returns points (negative cost)."""
-        from app.core.lmsr import calculate_trade_cost
-
         quantities = [Decimal("10"), Decimal("0")]
         b = Decimal("100")
         outcome_index = 0
@@ -172,10 +184,30 @@ class TestLMSRTradeCost:
 
         assert cost < Decimal("0")
 
+    @pytest.mark.parametrize(
+        ("quantities", "outcome_index", "quantity_delta", "expected"),
+        [
+            (["0", "4000"], 1, "-3900", "-3868.6738"),
+            (["0", "0", "3000"], 2, "-3000", "-2890.1388"),
+            (["0", "80000"], 1, "-79000", "-78999.9955"),  # e_0 underflows
+        ],
+    )
+    def test_sell_dominant_outcome(
+        self, quantities: list[str], outcome_index: int, quantity_delta: str, expected: str
+    ) -> None:
+        """Selling most of a dominant outcome should refund C(q_old) - C(q_new)."""
+        qs = [Decimal(q) for q in quantities]
+
+        cost = calculate_trade_cost(qs, outcome_index, Decimal(quantity_delta), Decimal("100"))
+        cost_float = calculate_trade_cost_float(
+            [float(q) for q in quantities], outcome_index, float(quantity_delta), 100.0
+        )
+
+        assert cost == Decimal(expected)
+        assert _to_decimal(cost_float) == Decimal(expected)
+
     def test_zero_quantity_zero_cost(self) -> None:
         """Test that zero quantity change has zero cost."""
-        from app.core.lmsr import calculate_trade_cost
-
         quantities = [Decimal("10"), Decimal("0")]
         b = Decimal("100")
         outcome_index = 0
@@ -187,19 +219,32 @@ class TestLMSRTradeCost:
 
     def test_trade_cost_approximates_price_for_small_trades(self) -> None:
         """Test that trade cost ≈ price * quantity for small trades."""
-        from app.core.lmsr import calculate_prices, calculate_trade_cost
-
-        quantities = [Decimal("0"), Decimal("0")]
-        b = Decimal("100")
+        quantities = [0.0, 0.0]
+        b = 100.0
         outcome_index = 0
-        quantity_delta = Decimal("1")
+        quantity_delta = 1.0
 
-        prices = calculate_prices(quantities, b)
-        cost = calculate_trade_cost(quantities, outcome_index, quantity_delta, b)
+        prices = calculate_prices_float(quantities, b)
+        cost = calculate_trade_cost_float(quantities, outcome_index, quantity_delta, b)
 
         # For small trades, cost ≈ price * quantity
-        expected_approx = prices[outcome_index] * quantity_delta
-        assert abs(cost - expected_approx) < Decimal("0.1")
+        assert cost == pytest.approx(prices[outcome_index] * quantity_delta, abs=0.1)
+
+    @pytest.mark.parametrize(
+        ("quantities", "k", "delta"),
+        [([0.0, 0.0], 0, 1.0), ([50.0, -20.0, 5.0], 2, -40.0), ([900.0, 0.0], 1, 3.5)],
+    )
+    def test_float_api_matches_decimal_api(
+        self, quantities: list[float], k: int, delta: float
+    ) -> None:
+        """Float siblings should agree with the Decimal API before quantization."""
+        qs = [Decimal(str(q)) for q in quantities]
+        b = Decimal("100")
+
+        prices = calculate_prices_float(quantities, 100.0)
+        assert [_to_decimal(p) for p in prices.tolist()] == calculate_prices(qs, b)
+        cost = calculate_trade_cost_float(quantities, k, delta, 100.0)
+        assert _to_decimal(cost) == calculate_trade_cost(qs, k, Decimal(str(delta)), b)
 
 
 class TestLMSRPriceBoundary:
@@ -207,15 +252,11 @@ class TestLMSRPriceBoundary:
 
     def test_price_boundary_constants_exist(self) -> None:
         """Test that price boundary constants are defined."""
-        from app.core.lmsr import MAX_PRICE, MIN_PRICE
-
         assert MIN_PRICE == Decimal("0.001")  # 0.1%
         assert MAX_PRICE == Decimal("0.999")  # 99.9%
 
     def test_prices_bounded_low(self) -> None:
         """Test that prices don't go below minimum."""
-        from app.core.lmsr import MIN_PRICE, calculate_prices
-
         # Very low quantity for first outcome
         quantities = [Decimal("-500"), Decimal("500")]
         b = Decimal("100")
@@ -226,8 +267,6 @@ class TestLMSRPriceBoundary:
 
     def test_prices_bounded_high(self) -> None:
         """Test that prices don't go above maximum."""
-        from app.core.lmsr import MAX_PRICE, calculate_prices
-
         # Very high quantity for first outcome
         quantities = [Decimal("500"), Decimal("-500")]
         b = Decimal("100")
@@ -238,10 +277,6 @@ class TestLMSRPriceBoundary:
 
     def test_is_trade_allowed_checks_boundary(self) -> None:
         """Test that is_trade_allowed checks price boundaries."""
-        from app.core.lmsr import is_trade_allowed
-
-        assert callable(is_trade_allowed)
-
         # Trade that would push price beyond boundary should be rejected
         quantities = [Decimal("500"), Decimal("0")]
         b = Decimal("100")
@@ -261,8 +296,6 @@ class TestLMSRNumericalPrecision:
 
     def test_uses_decimal_not_float(self) -> None:
         """Test that LMSR functions use Decimal for precision."""
-        from app.core.lmsr import calculate_prices, cost_function
-
         quantities = [Decimal("0"), Decimal("0")]
         b = Decimal("100")
 
@@ -273,21 +306,23 @@ class TestLMSRNumericalPrecision:
         for price in prices:
             assert isinstance(price, Decimal)
 
+    def test_float_results_round_half_up_on_shortest_repr(self) -> None:
+        """Float results should round as their printed value, not the binary expansion."""
+        # 0.12345 is stored as 0.123449999..., but should still round up
+        assert _to_decimal(0.12345) == Decimal("0.1235")
+        assert _to_decimal(-0.00005) == Decimal("-0.0001")
+
     def test_precision_maintained_large_numbers(self) -> None:
         """Test precision with large numbers."""
-        from app.core.lmsr import calculate_prices
-
         quantities = [Decimal("10000"), Decimal("10000")]
         b = Decimal("1000")
         prices = calculate_prices(quantities, b)
 
         total = sum(prices)
-        assert abs(total - Decimal("1")) < Decimal("0.0001")
+        assert _f(total) == pytest.approx(1.0, abs=0.0001)
 
     def test_precision_maintained_small_differences(self) -> None:
         """Test precision with small differences."""
-        from app.core.lmsr import calculate_prices
-
         # Use a difference large enough to be visible after rounding (> 0.0001)
         quantities = [Decimal("100.1"), Decimal("100.0")]
         b = Decimal("100")
@@ -302,8 +337,6 @@ class TestLMSRBinaryMarket:
 
     def test_binary_market_two_outcomes(self) -> None:
         """Test binary market has exactly 2 outcomes."""
-        from app.core.lmsr import calculate_prices
-
         quantities = [Decimal("0"), Decimal("0")]
         b = Decimal("100")
         prices = calculate_prices(quantities, b)
@@ -312,19 +345,15 @@ class TestLMSRBinaryMarket:
 
     def test_binary_50_50_start(self) -> None:
         """Test binary market starts at 50/50."""
-        from app.core.lmsr import calculate_prices
-
         quantities = [Decimal("0"), Decimal("0")]
         b = Decimal("100")
         prices = calculate_prices(quantities, b)
 
-        assert abs(prices[0] - Decimal("0.5")) < Decimal("0.0001")
-        assert abs(prices[1] - Decimal("0.5")) < Decimal("0.0001")
+        assert _f(prices[0]) == pytest.approx(0.5, abs=0.0001)
+        assert _f(prices[1]) == pytest.approx(0.5, abs=0.0001)
 
     def test_binary_buy_yes_increases_yes_price(self) -> None:
         """Test buying YES increases YES price."""
-        from app.core.lmsr import calculate_prices
-
         b = Decimal("100")
 
         prices_before = calculate_prices([Decimal("0"), Decimal("0")], b)
@@ -339,21 +368,17 @@ class TestLMSRCategoricalMarket:
 
     def test_categorical_equal_start(self) -> None:
         """Test categorical market starts with equal probabilities."""
-        from app.core.lmsr import calculate_prices
-
         # 4 outcomes
         quantities = [Decimal("0")] * 4
         b = Decimal("100")
         prices = calculate_prices(quantities, b)
 
-        expected = Decimal("1") / Decimal("4")
+        expected = 1 / 4
         for price in prices:
-            assert abs(price - expected) < Decimal("0.0001")
+            assert _f(price) == pytest.approx(expected, abs=0.0001)
 
     def test_categorical_buy_increases_that_outcome(self) -> None:
         """Test buying one outcome increases its price and decreases others."""
-        from app.core.lmsr import calculate_prices
-
         b = Decimal("100")
 
         prices_before = calculate_prices([Decimal("0")] * 3, b)
@@ -373,8 +398,6 @@ class TestLMSRLiquidityParameter:
 
     def test_higher_b_smaller_price_change(self) -> None:
         """Test that higher b results in smaller price changes."""
-        from app.core.lmsr import calculate_prices
-
         quantities_before = [Decimal("0"), Decimal("0")]
         quantities_after = [Decimal("10"), Decimal("0")]
 
@@ -393,15 +416,13 @@ class TestLMSRLiquidityParameter:
 
     def test_recommended_b_range(self) -> None:
         """Test that recommended b values (100-1000) work correctly."""
-        from app.core.lmsr import calculate_prices
-
         quantities = [Decimal("10"), Decimal("10")]
 
         for b_value in [100, 500, 1000]:
             b = Decimal(str(b_value))
             prices = calculate_prices(quantities, b)
             total = sum(prices)
-            assert abs(total - Decimal("1")) < Decimal("0.0001")
+            assert _f(total) == pytest.approx(1.0, abs=0.0001)
 
 
 class TestLMSREdgeCases:
@@ -409,36 +430,26 @@ class TestLMSREdgeCases:
 
     def test_single_outcome_raises_error(self) -> None:
         """Test that single outcome market raises error."""
-        from app.core.lmsr import calculate_prices
-
         with pytest.raises(ValueError):
             calculate_prices([Decimal("0")], Decimal("100"))
 
     def test_empty_quantities_raises_error(self) -> None:
         """Test that empty quantities raises error."""
-        from app.core.lmsr import calculate_prices
-
         with pytest.raises(ValueError):
             calculate_prices([], Decimal("100"))
 
     def test_zero_b_raises_error(self) -> None:
         """Test that zero liquidity parameter raises error."""
-        from app.core.lmsr import calculate_prices
-
         with pytest.raises(ValueError):
             calculate_prices([Decimal("0"), Decimal("0")], Decimal("0"))
 
     def test_negative_b_raises_error(self) -> None:
         """Test that negative liquidity parameter raises error."""
-        from app.core.lmsr import calculate_prices
-
         with pytest.raises(ValueError):
             calculate_prices([Decimal("0"), Decimal("0")], Decimal("-100"))
 
     def test_very_large_quantities(self) -> None:
         """Test handling of very large quantities (overflow prevention)."""
-        from app.core.lmsr import calculate_prices
-
         # Large but manageable quantities
         quantities = [Decimal("10000"), Decimal("0")]
         b = Decimal("100")
@@ -446,4 +457,160 @@ class TestLMSREdgeCases:
         # Should not raise overflow error
         prices = calculate_prices(quantities, b)
         total = sum(prices)
-        assert abs(total - Decimal("1")) < Decimal("0.01")
+        assert _f(total) == pytest.approx(1.0, abs=0.01)
+
+
+class TestLMSRIncrementalUpdate:
+    """Tests for the O(1) single-outcome LMSR update."""
+
+    @pytest.mark.parametrize(
+        ("quantities", "k", "q_k_new"),
+        [
+            ([0.0, 0.0], 0, 10.0),
+            ([50.0, -20.0, 5.0], 2, -40.0),
+            ([50.0, -20.0, 5.0], 1, 500.0),  # new value exceeds the shift
+            ([300.0, 0.0, 0.0, 0.0], 0, 250.0),
+            ([0.0, 4000.0], 1, 100.0),  # selling the dominant outcome
+            ([0.0, 0.0, 3000.0], 2, 0.0),
+            ([0.0, 80000.0], 1, 1000.0),  # other outcomes underflow to 0
+        ],
+    )
+    def test_incremental_matches_full_kernel(
+        self, quantities: list[float], k: int, q_k_new: float
+    ) -> None:
+        """Incremental cost/price should match a full recomputation."""
+        b = 100.0
+        qs = np.array(quantities, dtype=np.float64)
+        e, m, total = _lmsr_state(qs, b)
+
+        cost, price_k = _lmsr_incremental(qs, e, m, total, b, k, q_k_new)
+
+        qs[k] = q_k_new
+        expected_cost, expected_prices = _lmsr_kernel(qs, b)
+        assert cost == pytest.approx(expected_cost, rel=1e-12)
+        assert price_k == pytest.approx(expected_prices[k], rel=1e-9)
+
+    @pytest.mark.parametrize(
+        ("quantities", "k", "q_k_new"),
+        [
+            ([0.0, 0.0], 0, 10.0),
+            ([50.0, -20.0, 5.0], 2, -40.0),
+            ([50.0, -20.0, 5.0], 1, 500.0),  # new value exceeds the shift
+            ([300.0, 0.0, 0.0, 0.0], 0, 250.0),
+            ([0.0, 0.0], 1, 1e-6),  # tiny trade
+            ([0.0, 4000.0], 1, 100.0),  # selling the dominant outcome
+            ([0.0, 0.0, 3000.0], 2, 0.0),
+        ],
+    )
+    def test_cost_delta_matches_cost_difference(
+        self, quantities: list[float], k: int, q_k_new: float
+    ) -> None:
+        """The fused log1p delta should equal C(q_new) - C(q_old)."""
+        b = 100.0
+        qs = np.array(quantities, dtype=np.float64)
+        e, m, total = _lmsr_state(qs, b)
+        cost_before, _ = _lmsr_kernel(qs, b)
+
+        delta = _lmsr_cost_delta(qs, e, m, total, b, k, q_k_new)
+
+        qs[k] = q_k_new
+        cost_after, _ = _lmsr_kernel(qs, b)
+        assert delta == pytest.approx(cost_after - cost_before, rel=1e-9, abs=1e-12)
+
+    def test_estimate_shares_round_trips_trade_cost(self) -> None:
+        """Shares estimated for a budget should cost about that budget."""
+        quantities = [Decimal("20"), Decimal("0"), Decimal("-5")]
+        b = Decimal("100")
+        target = Decimal("25")
+
+        shares = estimate_shares_for_cost(quantities, 1, target, b)
+        cost = calculate_trade_cost(quantities, 1, shares, b)
+
+        assert abs(_f(cost) - _f(target)) <= 0.001
+
+    def test_estimate_shares_for_very_cheap_outcome(self) -> None:
+        """A near-zero price should not blow up the first Newton step."""
+        quantities = [Decimal("385.63"), Decimal("-483.56")]
+        b = Decimal("10")
+        target = Decimal("1011.39")
+
+        shares = estimate_shares_for_cost(quantities, 1, target, b)
+
+        assert shares == Decimal("1880.5800")
+        assert abs(_f(calculate_trade_cost(quantities, 1, shares, b)) - _f(target)) <= 0.001
+
+    def test_estimate_shares_without_convergence_returns_affordable_quantity(self) -> None:
+        """Running out of iterations should return the bracket's affordable end."""
+        quantities = [Decimal("0"), Decimal("0")]
+        b = Decimal("100")
+        target = Decimal("50")
+
+        shares = estimate_shares_for_cost(quantities, 0, target, b, max_iterations=1)
+
+        assert shares < estimate_shares_for_cost(quantities, 0, target, b)
+        assert calculate_trade_cost(quantities, 0, shares, b) <= target
+
+    def test_estimate_shares_rejects_bad_outcome_index(self) -> None:
+        """Out-of-range outcome index should raise ValueError."""
+        with pytest.raises(ValueError):
+            estimate_shares_for_cost([Decimal("0"), Decimal("0")], 2, Decimal("10"), Decimal("100"))
+
+
+class TestLMSRTradeAllowed:
+    """Tests for is_trade_allowed price boundary checks."""
+
+    def test_trade_within_bounds_allowed(self) -> None:
+        """A modest trade should be allowed."""
+        allowed, reason = is_trade_allowed(
+            [Decimal("0"), Decimal("0")], 0, Decimal("10"), Decimal("100")
+        )
+        assert allowed is True
+        assert reason is None
+
+    def test_trade_above_maximum_rejected(self) -> None:
+        """A trade pushing a price above MAX_PRICE should name that outcome."""
+        allowed, reason = is_trade_allowed(
+            [Decimal("500"), Decimal("0")], 0, Decimal("1000"), Decimal("100")
+        )
+        assert allowed is False
+        assert reason is not None
+        assert "outcome 0 price above maximum" in reason
+
+    def test_trade_below_minimum_rejected(self) -> None:
+        """The first out-of-bounds outcome should be reported."""
+        allowed, reason = is_trade_allowed(
+            [Decimal("0"), Decimal("0"), Decimal("0")], 0, Decimal("-1000"), Decimal("100")
+        )
+        assert allowed is False
+        assert reason is not None
+        assert "outcome 0 price below minimum" in reason
+
+    def test_large_market_uses_same_checks(self) -> None:
+        """Markets above the scalar-loop cutoff should report the same way."""
+        quantities = [Decimal("0")] * 6
+        allowed, reason = is_trade_allowed(quantities, 3, Decimal("-1000"), Decimal("100"))
+        assert allowed is False
+        assert reason is not None
+        assert "outcome 3 price below minimum" in reason
+
+        allowed, reason = is_trade_allowed(quantities, 3, Decimal("10"), Decimal("100"))
+        assert allowed is True
+        assert reason is None
+
+
+class TestLMSRBinaryKernel:
+    """Tests for the two-outcome kernel specialization."""
+
+    @pytest.mark.parametrize(
+        "quantities",
+        [[0.0, 0.0], [10.0, 0.0], [-35.5, 120.25], [90000.0, 0.0], [0.0, -90000.0]],
+    )
+    def test_binary_kernel_matches_general_kernel(self, quantities: list[float]) -> None:
+        """The binary fast path should agree with the N-outcome formulation."""
+        b = 100.0
+        qs = np.array(quantities, dtype=np.float64)
+        cost, prices = _lmsr_kernel(qs, b)
+
+        e, m, total = _lmsr_state(qs, b)
+        assert cost == pytest.approx(b * (m + math.log(total)), rel=1e-12)
+        np.testing.assert_allclose(prices, e / total, rtol=1e-12, atol=1e-300)
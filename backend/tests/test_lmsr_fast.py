@@ -0,0 +1,80 @@
+"""
+Tests for batched LMSR evaluation.
+SPEC Section 3.3 compliant.
+"""
+from __future__ import annotations
+
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+import app.core.lmsr_fast as lmsr_fast
+from app.core.lmsr import calculate_prices, cost_function
+from app.core.lmsr_fast import NUMBA_AVAILABLE, calculate_prices_batch, lmsr_batch
+
+
+class TestLMSRBatch:
+    """Tests for lmsr_batch over (markets x outcomes) arrays."""
+
+    def test_batch_matches_scalar_functions(self) -> None:
+        """Each row should match cost_function / calculate_prices."""
+        quantities = np.array([[0.0, 0.0, 0.0], [10.0, -5.0, 2.5], [300.0, 0.0, -120.0]])
+        b = np.array([100.0, 50.0, 200.0])
+
+        costs, prices = lmsr_batch(quantities, b)
+
+        for row, b_i, cost, row_prices in zip(quantities, b, costs, prices, strict=True):
+            qs = [Decimal(str(q)) for q in row]
+            b_dec = Decimal(str(b_i))
+            assert Decimal(str(cost)) == pytest.approx(cost_function(qs, b_dec), abs=1e-4)
+            expected = calculate_prices(qs, b_dec, apply_bounds=False)
+            assert [float(p) for p in expected] == pytest.approx(row_prices, abs=1e-4)
+
+    def test_batch_prices_sum_to_one(self) -> None:
+        """Prices in every market should sum to one."""
+        rng = np.random.default_rng(0)
+        _, prices = lmsr_batch(rng.normal(0, 500, size=(64, 5)), np.full(64, 100.0))
+
+        np.testing.assert_allclose(prices.sum(axis=1), 1.0)
+
+    @pytest.mark.parametrize(
+        ("quantities", "b"),
+        [
+            (np.zeros(2), np.array([100.0])),
+            (np.zeros((2, 1)), np.array([100.0, 100.0])),
+            (np.zeros((2, 2)), np.array([100.0])),
+            (np.zeros((2, 2)), np.array([100.0, 0.0])),
+        ],
+    )
+    def test_batch_rejects_invalid_input(self, quantities: np.ndarray, b: np.ndarray) -> None:
+        """Bad shapes or non-positive b should raise ValueError."""
+        with pytest.raises(ValueError):
+            lmsr_batch(quantities, b)
+
+    def test_batch_prices_match_scalar(self) -> None:
+        """Bounded batch prices should match calculate_prices row by row."""
+        quantities = np.array([[0.0, 0.0], [900.0, 0.0], [10.0, -5.0], [-800.0, 0.0]])
+        b = np.full(4, 100.0)
+
+        prices = calculate_prices_batch(quantities, b)
+
+        for row, row_prices in zip(quantities, prices, strict=True):
+            expected = calculate_prices([Decimal(str(q)) for q in row], Decimal("100"))
+            assert np.allclose(row_prices, [float(p) for p in expected], atol=1e-4)
+        np.testing.assert_allclose(prices.sum(axis=1), 1.0)
+
+    @pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba is not installed")
+    def test_numba_kernel_matches_numpy_kernel(self) -> None:
+        """The JIT kernel should agree with the NumPy fallback."""
+        rng = np.random.default_rng(1)
+        q = rng.normal(0, 500, size=(64, 5))
+        b = rng.uniform(10, 500, size=64)
+        numba_out = (np.empty(64), np.empty_like(q))
+        numpy_out = (np.empty(64), np.empty_like(q))
+
+        lmsr_fast._lmsr_batch_numba(q, b, *numba_out)
+        lmsr_fast._lmsr_batch_numpy(q, b, *numpy_out)
+
+        np.testing.assert_allclose(numba_out[0], numpy_out[0], rtol=1e-9)
+        np.testing.assert_allclose(numba_out[1], numpy_out[1], rtol=1e-9, atol=1e-300)
@@ -1,14 +1,22 @@
 """
 Tests for main application endpoints
 """
+from collections.abc import Iterator
+
+import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
 
-client = TestClient(app)
+
+@pytest.fixture(scope="module")
+def client() -> Iterator[TestClient]:
+    """Test client entered once so the app lifespan runs once per module"""
+    with TestClient(app) as client:
+        yield client
 
 
-def test_read_root() -> None:
+def test_read_root(client: TestClient) -> None:
     """Test root endpoint"""
     response = client.get("/")
     assert response.status_code == 200
@@ -17,9 +25,19 @@ def test_read_root() -> None:
     assert data["status"] == "ok"
 
 
-def test_health_check() -> None:
+def test_health_check(client: TestClient) -> None:
     """Test health check endpoint"""
     response = client.get("/health")
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
+
+
+def test_openapi_declares_bearer_scheme(client: TestClient) -> None:
+    """Protected routes should advertise the HTTP Bearer scheme in OpenAPI"""
+    schema = client.get("/openapi.json").json()
+    assert schema["components"]["securitySchemes"]["HTTPBearer"] == {
+        "type": "http",
+        "scheme": "bearer",
+    }
+    assert schema["paths"]["/api/v1/me"]["get"]["security"] == [{"HTTPBearer": []}]
@@ -3,53 +3,89 @@ Tests for Alembic migrations.
 """
 from __future__ import annotations
 
-import asyncio
+import shutil
+from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
 from alembic.config import Config
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy import Engine, create_engine, inspect, text
 
 from alembic import command
+from tests._schema_constants import EXPECTED_USER_COLUMNS
 
-BASE_DIR = Path(__file__).resolve().parents[1]
 
+def copy_migrated_db(template: Path, tmp_path: Path) -> Path:
+    """Copy the session's migrated SQLite template into this test's directory."""
+    db_file = tmp_path / "test.db"
+    shutil.copyfile(template, db_file)
+    return db_file
 
-def run_upgrade(database_url: str) -> None:
-    """Run Alembic upgrade to head for the given database URL."""
-    alembic_cfg = Config(str(BASE_DIR / "alembic.ini"))
-    alembic_cfg.set_main_option("sqlalchemy.url", database_url)
-    command.upgrade(alembic_cfg, "head")
 
+@pytest.fixture
+def migrated_engine(
+    migrated_db_template: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[Engine]:
+    """Sync engine on a private copy of the migrated database, disposed after the test."""
+    db_file = copy_migrated_db(migrated_db_template, tmp_path)
+    monkeypatch.setenv("DATABASE_URL", f"sqlite+aiosqlite:///{db_file}")
 
-async def get_table_columns(engine: AsyncEngine, table: str) -> set[str]:
-    """Fetch column names for a table (SQLite pragma)."""
-    async with engine.connect() as conn:
-        result = await conn.execute(text(f"PRAGMA table_info('{table}')"))
-        return {row[1] for row in result}
+    engine = create_engine(f"sqlite:///{db_file}")
+    yield engine
+    engine.dispose()
 
 
-@pytest.mark.asyncio
-async def test_initial_migration_creates_users_table(tmp_path, monkeypatch) -> None:
+def test_initial_migration_creates_users_table(migrated_engine: Engine) -> None:
     """Alembic initial migration should create users table with expected columns."""
+    inspector = inspect(migrated_engine)
+    assert inspector.has_table("users")
+    columns = {column["name"] for column in inspector.get_columns("users")}
+
+    # Original columns + those added in migration 20241212_000001
+    assert columns >= EXPECTED_USER_COLUMNS, f"Missing columns: {EXPECTED_USER_COLUMNS - columns}"
+
+
+def test_migrations_create_categories_sort_order_index(migrated_engine: Engine) -> None:
+    """Alembic head should include the categories sort_order index."""
+    indexes = {index["name"] for index in inspect(migrated_engine).get_indexes("categories")}
+
+    assert "ix_categories_sort_order" in indexes
+
+
+def run_migration(
+    alembic_config: Config, database_url: str, direction: str, revision: str
+) -> None:
+    """Run Alembic upgrade/downgrade to the given revision."""
+    alembic_config.set_main_option("sqlalchemy.url", database_url)
+    getattr(command, direction)(alembic_config, revision)
+
+
+def test_balance_migration_converts_to_hundredths(
+    alembic_config: Config, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Existing balances should round-trip through the BIGINT hundredths migration."""
     db_file = tmp_path / "test.db"
     database_url = f"sqlite+aiosqlite:///{db_file}"
     monkeypatch.setenv("DATABASE_URL", database_url)
 
-    await asyncio.to_thread(run_upgrade, database_url)
-
-    engine = create_async_engine(database_url)
-    async with engine.connect() as conn:
-        result = await conn.execute(
-            text("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
-        )
-        assert result.scalar() == "users"
-
-    columns = await get_table_columns(engine, "users")
-    # Check original columns + new columns added in migration 20241212_000001
-    expected_columns = {
-        "id", "email", "name", "role", "created_at",
-        "department", "balance", "updated_at",
-    }
-    assert expected_columns.issubset(columns), f"Missing columns: {expected_columns - columns}"
+    # Sync test: Alembic's env.py runs its own event loop, so no thread hop is needed
+    run_migration(alembic_config, database_url, "upgrade", "20241224_000002")
+    engine = create_engine(f"sqlite:///{db_file}")
+    try:
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "INSERT INTO users (id, email, role, balance) "
+                    "VALUES (1, 'a@example.com', 'user', 1234.56)"
+                )
+            )
+
+        run_migration(alembic_config, database_url, "upgrade", "head")
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT balance FROM users")).scalar() == 123456
+
+        run_migration(alembic_config, database_url, "downgrade", "20241224_000002")
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT balance FROM users")).scalar() == 1234.56
+    finally:
+        engine.dispose()